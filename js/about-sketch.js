@@ -1,5 +1,5 @@
 // Reusable sketch factory for creating coin background on any section
-// OPTIMIZED: Frame rate limited, visibility-based rendering
+// OPTIMIZED: Driven by AnimationScheduler, stops once every coin has settled
 
 const createCoinSketch = (sectionSelector, canvasParentId) => {
   return (p) => {
@@ -7,21 +7,12 @@ const createCoinSketch = (sectionSelector, canvasParentId) => {
     let icons = [];
     let gridCols, gridRows;
     let spacing = 100;
-    let isVisible = true;
     let allSettled = false; // Track if all icons have settled
 
     p.preload = () => {
       img = p.loadImage("assets/images/pattern-old-coin.png");
     };
 
-    // Check if section is in viewport
-    function checkVisibility() {
-      const section = document.querySelector(sectionSelector);
-      if (!section) return false;
-      const rect = section.getBoundingClientRect();
-      return rect.bottom > 0 && rect.top < window.innerHeight;
-    }
-
     p.setup = () => {
       const section = document.querySelector(sectionSelector);
       if (!section) return;
@@ -35,7 +26,7 @@ const createCoinSketch = (sectionSelector, canvasParentId) => {
       p.imageMode(p.CENTER);
       p.noStroke();
       p.clear();
-      p.frameRate(24); // Limit frame rate
+      p.noLoop(); // Redrawn by the shared scheduler while the section is on screen
 
       gridCols = Math.ceil((p.width + spacing) / spacing);
       gridRows = Math.ceil((p.height + spacing) / spacing);
@@ -58,13 +49,11 @@ const createCoinSketch = (sectionSelector, canvasParentId) => {
           });
         }
       }
+
+      AnimationScheduler.register(p, { elements: [section], priority: 1, fps: 24, budget: 4 });
     };
 
     p.draw = () => {
-      // Only render if visible
-      isVisible = checkVisibility();
-      if (!isVisible) return;
-
       p.clear();
 
       let settledCount = 0;
@@ -93,8 +82,9 @@ const createCoinSketch = (sectionSelector, canvasParentId) => {
         p.pop();
       }
 
-      // If all icons are spinning (settled), we could further reduce updates
+      // Once every icon has settled the field is static, so stop redrawing it
       allSettled = (settledCount === icons.length);
+      if (allSettled) AnimationScheduler.sleep(p);
     };
 
     p.windowResized = () => {
@@ -105,6 +95,8 @@ const createCoinSketch = (sectionSelector, canvasParentId) => {
         p.windowWidth,
         section.offsetHeight
       );
+      // Resizing clears the canvas; repaint even if the scheduler has stopped us
+      p.redraw();
     };
   };
 };
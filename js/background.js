@@ -1,12 +1,16 @@
 // ===== ANIMATED BACKGROUND - Color Strips =====
 // Adapted from sketch.js - p5.js background animation
-// OPTIMIZED: Frame rate limited, visibility-based rendering
+// OPTIMIZED: One p5 instance serves every background container. The colour
+// field is computed into a small pixel buffer (one pixel per strip per row)
+// and blitted, scaled up, onto each canvas instead of one rect() per row.
+// Frames are driven by AnimationScheduler, which pauses it while off screen.
 
-const backgroundSketch = (p) => {
+const BG_CONTAINER_IDS = ["bg-canvas-home-1", "bg-canvas-home-2"];
+
+const createBackgroundSketch = (containerIds) => (p) => {
   let strips = [];
-  let stripCount;
+  let targets = [];
   let speedFactor = 3; // Slower for subtle effect
-  let isVisible = true;
 
   // Color preset - sunset theme
   const theme = {
@@ -15,290 +19,186 @@ const backgroundSketch = (p) => {
     saturation: 50,
     brightness: 90
   };
+  const stripAlpha = 0.7;
+  const backgroundRGB = hsbToRgb(210, 30, 95);
+
+  // A strip's column is only recomputed once its phase has moved this far,
+  // which is below what the eye can pick out between frames.
+  const phaseEpsilon = 0.01;
 
   // Responsive config
-  let device = "desktop";
-  let stripBase = 18;
-  let stripMin = 6;
-  let stripMax = 28;
-  let yStep = 2;
-  let speedMin = 0.001;
-  let speedMax = 0.003;
+  const presets = {
+    mobile: { stripBase: 28, stripMin: 16, stripMax: 40, yStep: 6, speedMin: 0.0005, speedMax: 0.0015 },
+    tablet: { stripBase: 22, stripMin: 10, stripMax: 32, yStep: 4, speedMin: 0.0008, speedMax: 0.002 },
+    desktop: { stripBase: 18, stripMin: 6, stripMax: 28, yStep: 3, speedMin: 0.001, speedMax: 0.003 }
+  };
+  let config = presets.desktop;
+
+  // Low-resolution field: columns = strips, rows = height / yStep
+  let buffer, bufferCtx, pixels;
+  let rows = 0;
+  let width = 0;
+  let height = 0;
 
   function detectDevice() {
     const w = p.windowWidth;
-    if (w < 600) device = "mobile";
-    else if (w < 1024) device = "tablet";
-    else device = "desktop";
+    if (w < 600) config = presets.mobile;
+    else if (w < 1024) config = presets.tablet;
+    else config = presets.desktop;
   }
 
-  function setupByDevice() {
-    if (device === "mobile") {
-      stripBase = 28;
-      stripMin = 16;
-      stripMax = 40;
-      yStep = 6; // Increased for performance
-      speedMin = 0.0005;
-      speedMax = 0.0015;
-    } else if (device === "tablet") {
-      stripBase = 22;
-      stripMin = 10;
-      stripMax = 32;
-      yStep = 4; // Increased for performance
-      speedMin = 0.0008;
-      speedMax = 0.002;
-    } else {
-      stripBase = 18;
-      stripMin = 6;
-      stripMax = 28;
-      yStep = 3; // Slightly increased for performance
-      speedMin = 0.001;
-      speedMax = 0.003;
-    }
-    stripCount = p.int(p.width / stripBase);
+  // p5 HSB (360, 100, 100) to 0-255 RGB
+  function hsbToRgb(h, s, v) {
+    s /= 100;
+    v /= 100;
+    const f = (n) => {
+      const k = (n + h / 60) % 6;
+      return Math.round((v - v * s * Math.max(0, Math.min(k, 4 - k, 1))) * 255);
+    };
+    return [f(5), f(3), f(1)];
   }
 
   function generateStrips() {
     strips = [];
+    const stripCount = p.int(width / config.stripBase);
     let x = 0;
     for (let i = 0; i < stripCount; i++) {
-      let w = p.random(stripMin, stripMax);
-      strips.push(new Strip(x, w));
+      let w = p.random(config.stripMin, config.stripMax);
+      strips.push(new Strip(i, x, w));
       x += w;
     }
+
+    rows = Math.ceil(height / config.yStep);
+    buffer = document.createElement("canvas");
+    buffer.width = Math.max(1, strips.length);
+    buffer.height = Math.max(1, rows);
+    bufferCtx = buffer.getContext("2d");
+    pixels = bufferCtx.createImageData(buffer.width, buffer.height);
   }
 
   class Strip {
-    constructor(x, w) {
+    constructor(index, x, w) {
+      this.index = index;
       this.x = x;
       this.w = w;
       this.phase = p.random(1000);
-      this.speed = p.random(speedMin, speedMax);
+      this.speed = p.random(config.speedMin, config.speedMax);
+      this.renderedPhase = -Infinity;
     }
 
     update() {
       this.phase += this.speed * speedFactor;
     }
 
-    display() {
-      for (let y = 0; y < p.height; y += yStep) {
-        let n = p.noise(this.x * 0.01, y * 0.005, this.phase);
-
-        let hue = theme.baseHue + p.sin(n * p.TWO_PI) * theme.hueRange;
-        let sat = theme.saturation + n * 20;
-        let bri = theme.brightness + p.sin(this.phase + y * 0.01) * 6;
-        let alpha = 70;
-
-        p.fill(hue, sat, bri, alpha);
-        p.rect(this.x, y, this.w, yStep + 1);
+    // Write this strip's column into the pixel buffer; false if unchanged
+    render(data, cols) {
+      if (Math.abs(this.phase - this.renderedPhase) < phaseEpsilon) return false;
+      this.renderedPhase = this.phase;
+
+      const nx = this.x * 0.01;
+      for (let row = 0; row < rows; row++) {
+        const y = row * config.yStep;
+        const n = p.noise(nx, y * 0.005, this.phase);
+
+        const hue = theme.baseHue + Math.sin(n * p.TWO_PI) * theme.hueRange;
+        const sat = theme.saturation + n * 20;
+        const bri = theme.brightness + Math.sin(this.phase + y * 0.01) * 6;
+        const rgb = hsbToRgb(hue, sat, bri);
+
+        // Pre-blend over the background so the buffer can stay opaque
+        const i = (row * cols + this.index) * 4;
+        data[i] = rgb[0] * stripAlpha + backgroundRGB[0] * (1 - stripAlpha);
+        data[i + 1] = rgb[1] * stripAlpha + backgroundRGB[1] * (1 - stripAlpha);
+        data[i + 2] = rgb[2] * stripAlpha + backgroundRGB[2] * (1 - stripAlpha);
+        data[i + 3] = 255;
       }
+      return true;
     }
   }
 
-  // Check if element is in viewport
-  function checkVisibility() {
-    const container = document.getElementById("bg-canvas-home-1");
-    if (!container) return false;
-    const rect = container.getBoundingClientRect();
-    return rect.bottom > 0 && rect.top < window.innerHeight;
+  function createTargets() {
+    targets = containerIds.map((id) => {
+      const container = document.getElementById(id);
+      const canvas = document.createElement("canvas");
+      container.appendChild(canvas);
+      return { container, canvas, ctx: canvas.getContext("2d") };
+    });
   }
 
-  p.setup = () => {
-    const container = document.getElementById("bg-canvas-home-1");
-    if (!container) return;
+  function resizeTargets() {
+    width = p.windowWidth;
+    height = p.windowHeight;
+    // The strips are blocky, so a 1x backing store looks the same as a
+    // devicePixelRatio one at a fraction of the fill cost.
+    targets.forEach((t) => {
+      t.canvas.width = width;
+      t.canvas.height = height;
+      t.ctx.imageSmoothingEnabled = false;
+    });
+  }
 
-    const c = p.createCanvas(p.windowWidth, p.windowHeight);
-    c.parent("bg-canvas-home-1");
+  function paint(target) {
+    const ctx = target.ctx;
+    ctx.fillStyle = `rgb(${backgroundRGB.join(",")})`;
+    ctx.fillRect(0, 0, width, height);
+    strips.forEach((s) => {
+      ctx.drawImage(buffer, s.index, 0, 1, rows, s.x, 0, s.w, rows * config.yStep);
+    });
+  }
 
-    p.colorMode(p.HSB, 360, 100, 100, 100);
-    p.noStroke();
-    p.frameRate(24); // Limit frame rate
+  p.setup = () => {
+    p.noCanvas();
+    p.noLoop();
 
+    createTargets();
     detectDevice();
-    setupByDevice();
+    resizeTargets();
     generateStrips();
+
+    AnimationScheduler.register(p, {
+      elements: targets.map((t) => t.container),
+      priority: 2,
+      fps: 24,
+      budget: 6
+    });
   };
 
   p.draw = () => {
-    // Only render if visible
-    isVisible = checkVisibility();
-    if (!isVisible) return;
-
-    p.background(210, 30, 95);
+    // The scheduler only calls us while at least one canvas is visible
+    const visible = targets.filter((t) => AnimationScheduler.isVisible(t.container));
+    if (!visible.length) return;
 
-    strips.forEach(s => {
+    let dirty = false;
+    strips.forEach((s) => {
       s.update();
-      s.display();
+      if (s.render(pixels.data, buffer.width)) dirty = true;
     });
+    if (!dirty) return;
+
+    bufferCtx.putImageData(pixels, 0, 0);
+    paint(visible[0]);
+    // Every other canvas shows the same frame
+    for (let i = 1; i < visible.length; i++) {
+      visible[i].ctx.drawImage(visible[0].canvas, 0, 0);
+    }
   };
 
   p.windowResized = () => {
-    const container = document.getElementById("bg-canvas-home-1");
-    if (!container) return;
-
-    p.resizeCanvas(p.windowWidth, p.windowHeight);
     detectDevice();
-    setupByDevice();
+    resizeTargets();
     generateStrips();
   };
 };
 
 // Initialize when DOM is ready (only once)
-let bgInitialized = false;
-let bg2Initialized = false;
+let bgSketch = null;
 
 function initBackground() {
-  // Initialize for home-1 (desktop) and home-2 (mobile only)
-  if (!bgInitialized) {
-    const container = document.getElementById("bg-canvas-home-1");
-    if (container && typeof p5 !== 'undefined') {
-      new p5(backgroundSketch);
-      bgInitialized = true;
-    }
-  }
-
-  // Initialize for home-2 (mobile only - will be hidden on desktop)
-  if (!bg2Initialized) {
-    const container2 = document.getElementById("bg-canvas-home-2");
-    if (container2 && typeof p5 !== 'undefined') {
-      // Use same background sketch as home-1 for home-2
-      const backgroundSketch2 = (p) => {
-        let strips = [];
-        let stripCount;
-        let speedFactor = 3;
-        let isVisible = true;
-
-        const theme = {
-          baseHue: 280,
-          hueRange: 60,
-          saturation: 50,
-          brightness: 90
-        };
-
-        let device = "desktop";
-        let stripBase = 18;
-        let stripMin = 6;
-        let stripMax = 28;
-        let yStep = 2;
-        let speedMin = 0.001;
-        let speedMax = 0.003;
-
-        function detectDevice() {
-          const w = p.windowWidth;
-          if (w < 600) device = "mobile";
-          else if (w < 1024) device = "tablet";
-          else device = "desktop";
-        }
-
-        function setupByDevice() {
-          if (device === "mobile") {
-            stripBase = 28;
-            stripMin = 16;
-            stripMax = 40;
-            yStep = 6;
-            speedMin = 0.0005;
-            speedMax = 0.0015;
-          } else if (device === "tablet") {
-            stripBase = 22;
-            stripMin = 10;
-            stripMax = 32;
-            yStep = 4;
-            speedMin = 0.0008;
-            speedMax = 0.002;
-          } else {
-            stripBase = 18;
-            stripMin = 6;
-            stripMax = 28;
-            yStep = 3;
-            speedMin = 0.001;
-            speedMax = 0.003;
-          }
-          stripCount = p.int(p.width / stripBase);
-        }
-
-        function generateStrips() {
-          strips = [];
-          let x = 0;
-          for (let i = 0; i < stripCount; i++) {
-            let w = p.random(stripMin, stripMax);
-            strips.push(new Strip(x, w));
-            x += w;
-          }
-        }
-
-        class Strip {
-          constructor(x, w) {
-            this.x = x;
-            this.w = w;
-            this.phase = p.random(1000);
-            this.speed = p.random(speedMin, speedMax);
-          }
-
-          update() {
-            this.phase += this.speed * speedFactor;
-          }
-
-          display() {
-            for (let y = 0; y < p.height; y += yStep) {
-              let n = p.noise(this.x * 0.01, y * 0.005, this.phase);
-              let hue = theme.baseHue + p.sin(n * p.TWO_PI) * theme.hueRange;
-              let sat = theme.saturation + n * 20;
-              let bri = theme.brightness + p.sin(this.phase + y * 0.01) * 6;
-              let alpha = 70;
-              p.fill(hue, sat, bri, alpha);
-              p.rect(this.x, y, this.w, yStep + 1);
-            }
-          }
-        }
+  if (bgSketch || typeof p5 === 'undefined') return;
 
-        function checkVisibility() {
-          const container = document.getElementById("bg-canvas-home-2");
-          if (!container) return false;
-          const rect = container.getBoundingClientRect();
-          return rect.bottom > 0 && rect.top < window.innerHeight;
-        }
-
-        p.setup = () => {
-          const container = document.getElementById("bg-canvas-home-2");
-          if (!container) return;
-
-          const c = p.createCanvas(p.windowWidth, p.windowHeight);
-          c.parent("bg-canvas-home-2");
-
-          p.colorMode(p.HSB, 360, 100, 100, 100);
-          p.noStroke();
-          p.frameRate(24);
-
-          detectDevice();
-          setupByDevice();
-          generateStrips();
-        };
-
-        p.draw = () => {
-          isVisible = checkVisibility();
-          if (!isVisible) return;
-
-          p.background(210, 30, 95);
-          strips.forEach(s => {
-            s.update();
-            s.display();
-          });
-        };
-
-        p.windowResized = () => {
-          const container = document.getElementById("bg-canvas-home-2");
-          if (!container) return;
-
-          p.resizeCanvas(p.windowWidth, p.windowHeight);
-          detectDevice();
-          setupByDevice();
-          generateStrips();
-        };
-      };
-
-      new p5(backgroundSketch2);
-      bg2Initialized = true;
-    }
+  const containerIds = BG_CONTAINER_IDS.filter((id) => document.getElementById(id));
+  if (containerIds.length) {
+    bgSketch = new p5(createBackgroundSketch(containerIds));
   }
 }
 
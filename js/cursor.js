@@ -1,11 +1,10 @@
 // ===== FLOWER CURSOR EFFECT =====
 // Adapted from sketch3.js - p5.js flower cursor
-// OPTIMIZED: Reduced redraws, throttled frame rate, cached calculations
+// OPTIMIZED: Driven by AnimationScheduler, sleeps while the mouse is idle
 
 const cursorSketch = (p) => {
   let cx, cy;
   let lastMouseX = 0, lastMouseY = 0;
-  let isMoving = false;
   let idleFrames = 0;
 
   p.setup = () => {
@@ -20,8 +19,9 @@ const cursorSketch = (p) => {
     cx = p.mouseX;
     cy = p.mouseY;
 
-    // Limit frame rate to reduce CPU usage
-    p.frameRate(30);
+    // Redrawn by the shared scheduler; highest priority since it follows the mouse
+    p.noLoop();
+    AnimationScheduler.register(p, { priority: 3, fps: 30, budget: 2 });
   };
 
   p.windowResized = () => {
@@ -35,27 +35,24 @@ const cursorSketch = (p) => {
     const mouseMoved = Math.abs(dx) > 0.5 || Math.abs(dy) > 0.5;
 
     if (mouseMoved) {
-      isMoving = true;
       idleFrames = 0;
       lastMouseX = p.mouseX;
       lastMouseY = p.mouseY;
     } else {
       idleFrames++;
-      // After 10 idle frames, stop redrawing to save CPU
+      // After 10 idle frames, stop redrawing until the mouse moves again
       if (idleFrames > 10) {
-        isMoving = false;
+        AnimationScheduler.sleep(p);
+        return;
       }
     }
 
-    // Only redraw if cursor is moving or recently moved
-    if (isMoving || idleFrames <= 10) {
-      p.clear();
+    p.clear();
 
-      cx = p.lerp(cx, p.mouseX, 0.75);
-      cy = p.lerp(cy, p.mouseY, 0.75);
+    cx = p.lerp(cx, p.mouseX, 0.75);
+    cy = p.lerp(cy, p.mouseY, 0.75);
 
-      drawFlower(cx, cy);
-    }
+    drawFlower(cx, cy);
   };
 
   function drawFlower(x, y) {
@@ -87,13 +84,20 @@ const cursorSketch = (p) => {
 // Only initialize on desktop (width >= 1025px)
 let cursorP5 = null;
 
+function wakeFlowerCursor() {
+  if (cursorP5) AnimationScheduler.wake(cursorP5);
+}
+
 function initFlowerCursor() {
   if (window.innerWidth >= 1025 && !cursorP5) {
     cursorP5 = new p5(cursorSketch);
     document.body.style.cursor = 'none';
+    window.addEventListener('mousemove', wakeFlowerCursor, { passive: true });
   }
 
   if (window.innerWidth < 1025 && cursorP5) {
+    window.removeEventListener('mousemove', wakeFlowerCursor);
+    AnimationScheduler.unregister(cursorP5);
     cursorP5.remove();
     cursorP5 = null;
     document.body.style.cursor = 'auto';
@@ -0,0 +1,134 @@
+// ===== ANIMATION SCHEDULER =====
+// One requestAnimationFrame loop for every p5 sketch on the page.
+// Sketches call p.noLoop() and register here; the scheduler redraws them
+// only while their element is on screen and the tab is visible, and runs
+// lower-priority sketches only if the frame still has time left.
+
+const AnimationScheduler = (() => {
+  const FRAME_BUDGET = 10; // ms of sketch work allowed per frame
+  const MIN_FPS = 6;
+  const TIMING_SLACK = 2; // ms, so a 30fps sketch doesn't miss every other 60Hz frame
+
+  const tasks = [];
+  const visibility = new Map(); // element -> is intersecting the viewport
+  let rafId = null;
+
+  const observer = 'IntersectionObserver' in window
+    ? new IntersectionObserver((entries) => {
+      entries.forEach(entry => visibility.set(entry.target, entry.isIntersecting));
+      schedule();
+    })
+    : null;
+
+  function isVisible(element) {
+    return !observer || visibility.get(element) === true;
+  }
+
+  function findTask(sketch) {
+    return tasks.find(task => task.sketch === sketch);
+  }
+
+  function isRunnable(task) {
+    return !task.sleeping && (!task.elements.length || task.elements.some(isVisible));
+  }
+
+  // Register a sketch (anything with redraw(), usually a p5 instance).
+  // options.elements - elements whose visibility gates the sketch; none = always on
+  // options.priority - higher runs first and is never skipped for budget
+  // options.fps      - target frame rate
+  // options.budget   - ms per redraw before the sketch's frame rate is halved
+  function register(sketch, options = {}) {
+    const task = {
+      sketch,
+      elements: options.elements || [],
+      priority: options.priority || 0,
+      fps: options.fps || 30,
+      budget: options.budget || 4,
+      throttle: 1,
+      cost: 0,
+      lastRun: 0,
+      sleeping: false
+    };
+
+    task.elements.forEach(el => observer?.observe(el));
+    tasks.push(task);
+    tasks.sort((a, b) => b.priority - a.priority);
+    schedule();
+    return task;
+  }
+
+  function unregister(sketch) {
+    const task = findTask(sketch);
+    if (!task) return;
+
+    tasks.splice(tasks.indexOf(task), 1);
+    task.elements.forEach(el => {
+      if (!tasks.some(t => t.elements.includes(el))) {
+        observer?.unobserve(el);
+        visibility.delete(el);
+      }
+    });
+  }
+
+  // Stop redrawing a sketch that has reached a static state
+  function sleep(sketch) {
+    const task = findTask(sketch);
+    if (task) task.sleeping = true;
+  }
+
+  function wake(sketch) {
+    const task = findTask(sketch);
+    if (task && task.sleeping) {
+      task.sleeping = false;
+      schedule();
+    }
+  }
+
+  function schedule() {
+    if (rafId === null && !document.hidden && tasks.some(isRunnable)) {
+      rafId = requestAnimationFrame(frame);
+    }
+  }
+
+  function frame(now) {
+    rafId = null;
+    const frameStart = performance.now();
+    let ran = 0;
+
+    // Tasks are sorted by priority, highest first
+    tasks.slice().forEach(task => {
+      if (!isRunnable(task)) return;
+      if (now - task.lastRun < (1000 / task.fps) * task.throttle - TIMING_SLACK) return;
+
+      // Over budget: leave lower-priority sketches for the next frame
+      if (ran > 0 && performance.now() - frameStart + task.cost > FRAME_BUDGET) return;
+
+      const start = performance.now();
+      task.sketch.redraw();
+      const cost = performance.now() - start;
+      task.cost = task.cost ? task.cost * 0.9 + cost * 0.1 : cost;
+      task.lastRun = now;
+      ran++;
+
+      // Degrade a sketch that keeps running over its own budget
+      if (task.cost > task.budget && task.fps / (task.throttle * 2) >= MIN_FPS) {
+        task.throttle *= 2;
+      } else if (task.cost < task.budget / 2 && task.throttle > 1) {
+        task.throttle /= 2;
+      }
+    });
+
+    schedule();
+  }
+
+  document.addEventListener('visibilitychange', () => {
+    if (document.hidden) {
+      cancelAnimationFrame(rafId);
+      rafId = null;
+    } else {
+      schedule();
+    }
+  });
+
+  return { register, unregister, sleep, wake, isVisible };
+})();
@@ -86,12 +86,13 @@ let towerImg;                     // Golden tower image
 let coinImg;                      // Coin image
 let josspaperImg1, josspaperImg2, josspaperImg3, josspaperImg4; // Joss paper assets
 let charmImg1, charmImg2;         // Additional charms
-let noiseImg;                     // Procedural noise texture
+let noiseTile;                    // Small procedural noise tile
+let noisePattern;                 // noiseTile as a repeating canvas pattern
 let sliderBox; // Container div for both sliders and labels
 let captureBox, btnPng, btnSvg; // screenshot box and buttons
 let resetBox, btnReset;        // reset box and button 
 
-// --- SOUND (audio assets) ---
+// --- SOUND (audio assets, decoded on first use - see LazySound) ---
 let buttonSound;                  // Start button sound effect
 let heavenSound;                  // Ambient heaven sound for main screen
 let knockingWoodenFishSound;      // Wooden fish loop during wish input
@@ -117,6 +118,7 @@ let screenOverlayColor;           // Semi-transparent screen overlay
 let bgFooterAlpha = 255;          // Footer text alpha (fades out during transition)
 const screenOverlayAlpha = 150;   // Overlay opacity
 const noiseDensity = 0.15;        // Noise density for procedural texture
+const noiseTileSize = 256;        // Noise tile edge (px), repeated over the screen
 const baseWidth = 1920;           // Reference width for responsive scaling
 const maxClusters = 50;          // maximum number of bloom clusters
 const minClusterSize = 200;      // min size of a cluster
@@ -132,42 +134,262 @@ let flyingAssets = [];            // Assets flying during tower transition
 let towerScaleFactor;             // Scaling factor for tower
 let flowerClusters = [];          // Blooming charms (text input background)
 let backgroundTexts = [];         // Random floating texts (wish transition)
+let textSprites = new Map();      // Pre-rendered floating texts, by style key
+const textSpriteVariants = 32;    // Distinct text styles shared by the floating texts
+const maxSpriteWidth = 4096;      // Device px; longer wishes get a lower-res sprite
+const maxSpritePixels = 8 * 1024 * 1024; // Device px shared by all text sprites (~32MB of canvas)
 
-// === PRELOAD (Load all assets before setup) ===
+// === PRELOAD (only what the start screen needs) ===
+// Everything else streams in by stage after setup() - see ASSET LOADING.
 function preload() {
-    // Load fonts
     customFont = loadFont('Fonts/NeueHaasDisplayRoman.ttf');
     fontList.push(customFont);
-    fontList.push(loadFont('Fonts/UTM Staccato.otf'));
-    fontList.push(loadFont('Fonts/UTM Aristote.otf'));
-    fontList.push(loadFont('Fonts/UTM Demian KT.otf'));
-    fontList.push(loadFont('Fonts/UTM Spring.otf'));
-
-    // Load images
-    carpTetImg = loadImage('asset/carp on Tet holiday.png');
-    overlayImg = loadImage('asset/Overlay.png');
-    luckyCharmImg1 = loadImage('asset/New Year lucky charm 1.png');
-    luckyCharmImg2 = loadImage('asset/New Year lucky charm 2.png');
-    textBoxImg = loadImage('asset/text box.png');
-    towerImg = loadImage('asset/Lucky Golden Tower.png');
-    coinImg = loadImage('asset/coin.png');
-    josspaperImg1 = loadImage('asset/Josspaper 1.png');
-    josspaperImg2 = loadImage('asset/Josspaper 2.png');
-    josspaperImg3 = loadImage('asset/Josspaper 3.png');
-    josspaperImg4 = loadImage('asset/Josspaper 4.png');
-    charmImg1 = loadImage('asset/New Year lucky charm 1.png');
-    charmImg2 = loadImage('asset/New Year lucky charm 2.png');
-
-    // Load sounds
+
     soundFormats('ogg', 'mp3');
-    buttonSound = loadSound('sounds/button sound.ogg');
-    heavenSound = loadSound('sounds/haeven sound.ogg');
-    knockingWoodenFishSound = loadSound('sounds/knocking wooden fish.ogg');
-    ambienceSound = loadSound('sounds/Ambience sound.ogg');
+    buttonSound = new LazySound('sounds/button sound.ogg');
+    heavenSound = new LazySound('sounds/haeven sound.ogg');
+    knockingWoodenFishSound = new LazySound('sounds/knocking wooden fish.ogg');
+    ambienceSound = new LazySound('sounds/Ambience sound.ogg');
 
-    // Load multiple typing sounds (w1–w10)
+    // Multiple typing sounds (w1–w10)
     for (let i = 1; i <= 10; i++) {
-        typingSounds.push(loadSound(`sounds/w${i}.ogg`));
+        typingSounds.push(new LazySound(`sounds/w${i}.ogg`));
+    }
+}
+
+// === ASSET LOADING (staged, in the background) ===
+// Assets are grouped by the first screen that needs them. Stages load one
+// after another while the user is still on earlier screens, and each screen
+// only waits for its own stage.
+const STAGES = ['main', 'textbox', 'tower'];
+
+// drawWidth(size) is the widest the image is ever drawn, in canvas pixels,
+// using the same formulas as calculateScale(), initializeCoins() and the
+// flying assets (whose size slider goes up to 2x).
+const IMAGE_ASSETS = [
+    { path: 'asset/carp on Tet holiday.png', stage: 'main', assign: (img) => carpTetImg = img,
+      drawWidth: (size) => min(width * 0.6, height * 0.6 * size.w / size.h) },
+    { path: 'asset/Overlay.png', stage: 'main', assign: (img) => overlayImg = img,
+      drawWidth: () => width },
+    { path: 'asset/New Year lucky charm 2.png', stage: 'main', assign: (img) => luckyCharmImg2 = charmImg2 = img,
+      drawWidth: (size) => size.w * 0.5 * width / baseWidth },
+    { path: 'asset/text box.png', stage: 'textbox', assign: (img) => textBoxImg = img,
+      drawWidth: () => isMobile() ? height : width * 0.6 },
+    { path: 'asset/New Year lucky charm 1.png', stage: 'textbox', assign: (img) => luckyCharmImg1 = charmImg1 = img,
+      drawWidth: (size) => max(maxClusterSize, size.w * 0.4 * width / baseWidth) },
+    { path: 'asset/Lucky Golden Tower.png', stage: 'tower', assign: (img) => towerImg = img,
+      drawWidth: (size) => min(width * 0.7, height * 0.7 * size.w / size.h) },
+    { path: 'asset/coin.png', stage: 'tower', assign: (img) => coinImg = img,
+      drawWidth: (size) => size.w * 0.4 * width / baseWidth },
+    { path: 'asset/Josspaper 1.png', stage: 'tower', assign: (img) => josspaperImg1 = img,
+      drawWidth: (size) => size.w * 0.4 * width / baseWidth },
+    { path: 'asset/Josspaper 2.png', stage: 'tower', assign: (img) => josspaperImg2 = img,
+      drawWidth: (size) => size.w * 0.4 * width / baseWidth },
+    { path: 'asset/Josspaper 3.png', stage: 'tower', assign: (img) => josspaperImg3 = img,
+      drawWidth: (size) => size.w * 0.4 * width / baseWidth },
+    { path: 'asset/Josspaper 4.png', stage: 'tower', assign: (img) => josspaperImg4 = img,
+      drawWidth: (size) => size.w * 0.4 * width / baseWidth }
+];
+const FONT_ASSETS = [
+    { path: 'Fonts/UTM Staccato.otf', stage: 'textbox' },
+    { path: 'Fonts/UTM Aristote.otf', stage: 'textbox' },
+    { path: 'Fonts/UTM Demian KT.otf', stage: 'textbox' },
+    { path: 'Fonts/UTM Spring.otf', stage: 'textbox' }
+];
+
+// Width tiers written by the site build (tools/images.py). When the sketch
+// is served straight from the source tree the manifest is missing and the
+// original PNGs are used.
+const TIER_MANIFEST = '../../assets/img/manifest.json';
+const TIER_ROOT = '../../';
+const TIER_SOURCE_PREFIX = 'sketch/code/';
+const TIER_FORMAT = 'webp';
+
+let stageProgress = {};           // stage -> { done, total }
+let artSizes = new Map();         // p5.Image -> size of the original artwork
+let tierManifest = null;          // Build manifest, once fetched (null without one)
+let loadedTiers = new Map();      // asset -> { width, img, loading } of the tier in use
+
+function stageReady(stage) {
+    const progress = stageProgress[stage];
+    return progress !== undefined && progress.done >= progress.total;
+}
+
+// Size of the original artwork, whichever tier was loaded
+function artSize(img) {
+    return artSizes.get(img) || { w: img.width, h: img.height };
+}
+
+// Pick the smallest tier at least as wide as the image is drawn
+function pickTier(manifest, asset) {
+    const record = manifest && manifest.sources[TIER_SOURCE_PREFIX + asset.path];
+    const entry = record && manifest.images[record.sha256];
+    if (!entry || !entry.variants[TIER_FORMAT]) return { url: asset.path, size: null, width: Infinity };
+
+    const size = { w: entry.width, h: entry.height };
+    const needed = asset.drawWidth(size) * pixelDensity();
+    const tiers = entry.variants[TIER_FORMAT];
+    const tier = tiers.find(([w]) => w >= needed) || tiers[tiers.length - 1];
+    return { url: TIER_ROOT + tier[1], size, width: tier[0] };
+}
+
+// Re-pick tiers after a resize and load a wider one in the background
+// wherever an image is now drawn wider than the tier it has. Shrinking
+// the window keeps the tiers already loaded.
+function upgradeTiers() {
+    loadedTiers.forEach((loaded, asset) => {
+        if (loaded.loading) return;
+        const tier = pickTier(tierManifest, asset);
+        if (tier.width <= loaded.width) return;
+        loaded.loading = true;
+        loadImage(tier.url, img => {
+            artSizes.set(img, tier.size);
+            swapTier(asset, loaded.img, img);
+            Object.assign(loaded, { width: tier.width, img, loading: false });
+            // The window may have grown again while this tier was loading
+            upgradeTiers();
+        }, () => {
+            // Keep drawing the smaller tier; the next resize tries again
+            loaded.loading = false;
+        });
+    });
+}
+
+// Replace a loaded tier everywhere it is drawn from
+function swapTier(asset, old, img) {
+    // The intro zoom is relative to the tier; keep the carp the same size
+    if (old === carpTetImg) carpCurrentScale *= old.width / img.width;
+    asset.assign(img);
+    [...allCoins, ...flyingAssets].forEach(o => {
+        if (o.img === old) o.img = img;
+    });
+    calculateScale();
+}
+
+function startAssetLoading() {
+    STAGES.forEach(stage => {
+        const total = IMAGE_ASSETS.filter(a => a.stage === stage).length +
+                      FONT_ASSETS.filter(a => a.stage === stage).length;
+        stageProgress[stage] = { done: 0, total };
+    });
+
+    fetch(TIER_MANIFEST)
+        .then(response => response.ok ? response.json() : null)
+        .catch(() => null)
+        .then(manifest => {
+            tierManifest = manifest;
+            loadStage(0, manifest);
+        });
+}
+
+function loadStage(index, manifest) {
+    if (index >= STAGES.length) return;
+    const stage = STAGES[index];
+    const progress = stageProgress[stage];
+
+    const finish = () => {
+        progress.done++;
+        if (progress.done === progress.total) {
+            onStageLoaded(stage);
+            loadStage(index + 1, manifest);
+        }
+    };
+
+    IMAGE_ASSETS.filter(a => a.stage === stage).forEach(asset => {
+        const tier = pickTier(manifest, asset);
+        loadImage(tier.url, img => {
+            if (tier.size) artSizes.set(img, tier.size);
+            asset.assign(img);
+            loadedTiers.set(asset, { width: tier.width, img, loading: false });
+            finish();
+        }, () => {
+            // A missing image must not stall the ritual; it is simply left out
+            console.warn(`Could not load ${asset.path}`);
+            finish();
+        });
+    });
+
+    FONT_ASSETS.filter(a => a.stage === stage).forEach(asset => {
+        loadFont(asset.path, font => {
+            fontList.push(font);
+            finish();
+        }, finish);
+    });
+
+    if (progress.total === 0) {
+        progress.done = progress.total;
+        onStageLoaded(stage);
+        loadStage(index + 1, manifest);
+    }
+}
+
+function onStageLoaded(stage) {
+    if (stage === 'main') {
+        calculateScale();
+        initializeCoins();
+        coinAnimationStartTime = millis();
+        // Decode the click now so the first tap on the main screen has it
+        buttonSound.load();
+        // Warm the HTTP cache for the sounds of the next screens
+        [heavenSound, knockingWoodenFishSound].forEach(s => s.prefetch());
+    } else if (stage === 'textbox') {
+        typingSounds.forEach(s => s.prefetch());
+    } else if (stage === 'tower') {
+        calculateScale();
+        ambienceSound.prefetch();
+    }
+}
+
+// Sound that is fetched in the background but only decoded the first time
+// it is used, so decoding never competes with the first frames.
+class LazySound {
+    constructor(path) {
+        this.path = path;
+        this.sound = null;
+        this.ready = false;
+        this.pending = [];
+    }
+
+    // Download only, into the HTTP cache
+    prefetch() {
+        fetch(this.path).then(response => response.blob()).catch(() => {});
+    }
+
+    load() {
+        if (this.sound) return;
+        this.sound = loadSound(this.path, () => {
+            this.ready = true;
+            const pending = this.pending;
+            this.pending = [];
+            pending.forEach(fn => fn(this.sound));
+        });
+    }
+
+    // Run fn with the decoded sound now, or as soon as it is decoded
+    use(fn) {
+        if (this.ready) {
+            fn(this.sound);
+        } else {
+            this.pending.push(fn);
+            this.load();
+        }
+    }
+
+    // Run fn only if already decoded (for short effects that would sound
+    // wrong if played late); starts decoding for next time otherwise.
+    ifReady(fn) {
+        if (this.ready) fn(this.sound);
+        else this.load();
+    }
+
+    isPlaying() {
+        return this.ready && this.sound.isPlaying();
+    }
+
+    // Stop playback and drop any use() still waiting on the decode
+    stop() {
+        this.pending = [];
+        if (this.isPlaying()) this.sound.stop();
     }
 }
 
@@ -224,18 +446,13 @@ function setup() {
     screenOverlayColor = color(0, 0, 0, screenOverlayAlpha);
     chosenOverlayColor = color(random(overlayColors));
 
-    // Scale carp and tower images to screen size
-    calculateScale();
-
-    // Create animated concentric coin circles around carp
-    initializeCoins();
-
     // Generate procedural noise texture (static grain layer)
     generateNoiseTexture();
 
-    // Trigger coin animation at startup
+    // Trigger coin animation as soon as the main screen assets arrive
+    // (scales and coin circles are set up in onStageLoaded)
     coinAnimationTriggered = true;
-    coinAnimationStartTime = millis();
+    startAssetLoading();
 
     //ChatGPT advanced knowledge
     // === SLIDER BOX (container for both sliders + labels) ===
@@ -305,27 +522,30 @@ function touchStarted() {
     // Unlock audio on first interaction (required by browsers)
     userStartAudio();
 
-    // Play button click sound if loaded
-    if (buttonSound && buttonSound.isLoaded()) buttonSound.play();
+    // Play button click sound (decoded with the main stage; a click that
+    // came late would sound wrong, so taps before that stay silent)
+    buttonSound.ifReady(s => s.play());
 
     // Ignore touches once final tower screen is active
     if (showTowerScreen) return;
 
     // --- From Start Screen → Main Screen ---
     if (showStartScreen) {
+        if (!stageReady('main')) return false; // Progress bar is still showing
         showStartScreen = false;
         showMainScreen = true;
         carpCurrentScale = 0.1; // Reset carp animation scale
 
         // Play heaven ambient sound (fade in)
-        if (heavenSound && heavenSound.isLoaded()) {
-            heavenSound.setVolume(0);
-            heavenSound.play();
-            heavenSound.amp(0.7, 3);
-        }
+        heavenSound.use(s => {
+            s.setVolume(0);
+            s.play();
+            s.amp(0.7, 3);
+        });
     } 
     // --- From Main Screen → TextBox Screen ---
     else if (showMainScreen) {
+        if (!stageReady('textbox')) return false;
         let carpW = carpTetImg.width * carpCurrentScale;
         let carpH = carpTetImg.height * carpCurrentScale;
         let cx = width / 2;
@@ -338,11 +558,13 @@ function touchStarted() {
             showTextBoxScreen = true;
 
             // Play wooden fish loop while typing wish
-            if (knockingWoodenFishSound && knockingWoodenFishSound.isLoaded()) {
-                knockingWoodenFishSound.setLoop(true);
-                knockingWoodenFishSound.setVolume(0.5);
-                knockingWoodenFishSound.play();
-            }
+            knockingWoodenFishSound.use(s => {
+                s.setLoop(true);
+                s.setVolume(0.5);
+                s.play();
+            });
+            // Decode the typing sounds now so the first keys aren't silent
+            typingSounds.forEach(s => s.load());
         }
     }
     return false; // Prevent default browser behavior
@@ -357,11 +579,10 @@ function keyTyped() {
             // Play random typing sound for effect
             if (typingSounds.length > 0) {
                 let idx = floor(random(typingSounds.length));
-                let s = typingSounds[idx];
-                if (s.isLoaded()) {
+                typingSounds[idx].ifReady(s => {
                     s.setVolume(0.3);
                     s.play();
-                }
+                });
             }
         }
     }
@@ -389,14 +610,12 @@ function keyPressed() {
         bgTextStartTime = millis();
         bgFooterAlpha = 255;
 
-        if (knockingWoodenFishSound && knockingWoodenFishSound.isLoaded()) {
-            knockingWoodenFishSound.stop();
-        }
-        if (ambienceSound && ambienceSound.isLoaded()) {
-            ambienceSound.loop();
-            ambienceSound.setVolume(0.6);
-            reverb.process(ambienceSound, 1, 0);
-    }
+        knockingWoodenFishSound.stop();
+        ambienceSound.use(s => {
+            s.loop();
+            s.setVolume(0.6);
+            reverb.process(s, 1, 0);
+        });
   }
 }
     }
@@ -413,7 +632,7 @@ function windowResized() {
     resizeCanvas(windowWidth, windowHeight);
     calculateScale();
     initializeCoins();
-    generateNoiseTexture();
+    upgradeTiers();
 
     // Reposition sliders if tower screen is active
     if (showTowerScreen) {
@@ -431,7 +650,34 @@ function drawStartScreen() {
     fill('#eabb47');
     textAlign(CENTER, CENTER);
     noStroke();
-    text("TAP TO START", width / 2, height / 2);
+    if (stageReady('main')) {
+        text("TAP TO START", width / 2, height / 2);
+    } else {
+        drawStageProgress('main', height / 2);
+    }
+}
+
+// Progress bar for a stage that is still loading
+function drawStageProgress(stage, y) {
+    const progress = stageProgress[stage] || { done: 0, total: 1 };
+    const pct = progress.total ? progress.done / progress.total : 0;
+    const barW = min(width * 0.5, 480);
+
+    push();
+    textFont(customFont);
+    textAlign(CENTER, CENTER);
+    textSize(32);
+    noStroke();
+    fill('#eabb47');
+    text(`LOADING ${round(pct * 100)}%`, width / 2, y - 30);
+    noFill();
+    stroke('#eabb47');
+    strokeWeight(2);
+    rect(width / 2 - barW / 2, y, barW, 12);
+    noStroke();
+    fill('#eabb47');
+    rect(width / 2 - barW / 2, y, barW * pct, 12);
+    pop();
 }
 
 // --- MAIN SCREEN ILLUSTRATION ---
@@ -441,7 +687,7 @@ function drawMainIllustration() {
     drawCoinCircles(); // Concentric rotating coin circles
     drawHaloRays(width / 2, height / 2, min(width, height) * 0.4); // Halo rays
     drawCenterpiece(); // Central carp
-    image(noiseImg, 0, 0, width, height); // Grain noise overlay
+    drawNoise(); // Grain noise overlay
 
     // Instruction text (pulsing alpha effect)
     textFont(customFont);
@@ -450,7 +696,11 @@ function drawMainIllustration() {
     let alpha = map(sin(frameCount * 0.05), -1, 1, 50, 255);
     fill(255, alpha);
     textSize(32);
-    text("Tap the josspaper to continue the ceremony", width / 2, height - 60);
+    if (stageReady('textbox')) {
+        text("Tap the josspaper to continue the ceremony", width / 2, height - 60);
+    } else {
+        drawStageProgress('textbox', height - 60);
+    }
 }
 
 // --- TEXTBOX SCREEN (wish input) ---
@@ -523,15 +773,16 @@ function drawRandomBackgroundPattern() {
   let sumAlpha = 0;          // count averange alpha
   let countAlpha = 0;
 
+  const ctx = drawingContext;
   for (let bg of backgroundTexts) {
     // bay lên
     bg.y -= bg.speed;
 
-    // hover -> move away
-    const tw = textWidth(bg.txt);
+    // hover -> move away (bounds measured once, in prepareBackgroundPattern)
+    const sprite = bg.sprite;
     if (!bg.exploded &&
-        mouseX > bg.x - tw / 2 && mouseX < bg.x + tw / 2 &&
-        mouseY > bg.y - bg.size / 2 && mouseY < bg.y + bg.size / 2) {
+        mouseX > bg.x - sprite.w / 2 && mouseX < bg.x + sprite.w / 2 &&
+        mouseY > bg.y - sprite.size / 2 && mouseY < bg.y + sprite.size / 2) {
       bg.exploded = true;
     }
 
@@ -539,24 +790,19 @@ function drawRandomBackgroundPattern() {
     bg.alpha -= bg.exploded ? 8 : 1.2;
 
     // see if still visible on screen (also alpha > 0) 
-    const visible = (bg.alpha > 0) && (bg.y + bg.size > 0);
+    const visible = (bg.alpha > 0) && (bg.y + sprite.size > 0);
     if (visible) {
       anyVisible = true;
-      // draw 
-      push();
-      textFont(bg.font);
-      textSize(bg.size);
-      fill(red(bg.color), green(bg.color), blue(bg.color), bg.alpha);
-      noStroke();
-      textAlign(CENTER, CENTER);
-      text(bg.txt, bg.x, bg.y);
-      pop();
+      // draw the cached sprite; same placement as text() with CENTER, CENTER
+      ctx.globalAlpha = bg.alpha / 255;
+      ctx.drawImage(sprite.canvas, bg.x - sprite.boxW / 2, bg.y - sprite.boxH / 2, sprite.boxW, sprite.boxH);
 
     // contribute to the average alpha to control the footer
       sumAlpha += bg.alpha;
       countAlpha++;
     }
   }
+  ctx.globalAlpha = 1;
 
 // --- Footer tutorial (desktop ONLY), with sync flashing + fading ---
   if (!isMobile()) {
@@ -578,11 +824,15 @@ function drawRandomBackgroundPattern() {
 // --- Phase exit condition: no more visible text
 // OR hard timeout to avoid jam (e.g. 18s) ---
   const timedOut = (millis() - bgTextStartTime) > 18000;
-  if (!anyVisible || timedOut) {
+  if ((!anyVisible || timedOut) && !stageReady('tower')) {
+    drawStageProgress('tower', height / 2);
+  } else if (!anyVisible || timedOut) {
     showBackgroundText = false;
     showTowerTransition = true;
     transitionStartTime = millis();
     initializeFlyingAssets();
+    backgroundTexts = [];
+    clearTextSprites();
   }
 }
 
@@ -851,6 +1101,7 @@ function reverbSliderChanged() {
 }
 
 // Calculate carp and tower scaling for responsive layout
+// (relative to the loaded tier; see IMAGE_ASSETS for the matching drawWidth)
 function calculateScale() {
     if (carpTetImg) {
         let sByW = (width * 0.6) / carpTetImg.width;
@@ -858,28 +1109,43 @@ function calculateScale() {
         carpScale = min(sByW, sByH);
         carpTargetScale = carpScale;
     }
-    towerScaleFactor = min(width * 0.7 / towerImg.width, height * 0.7 / towerImg.height);
+    if (towerImg) {
+        towerScaleFactor = min(width * 0.7 / towerImg.width, height * 0.7 / towerImg.height);
+    }
 }
 
-// Generate static procedural noise texture
+// Generate static procedural noise tile (once; it is repeated to any size,
+// so resizing the window costs nothing)
 function generateNoiseTexture() {
-    noiseImg = createGraphics(width, height);
-    noiseImg.pixelDensity(1);
-    noiseImg.loadPixels();
-    for (let i = 0; i < (noiseImg.width * noiseImg.height * 4); i += 4) {
+    if (noisePattern) return;
+    noiseTile = createGraphics(noiseTileSize, noiseTileSize);
+    noiseTile.pixelDensity(1);
+    noiseTile.loadPixels();
+    for (let i = 0; i < (noiseTile.width * noiseTile.height * 4); i += 4) {
         if (random() < noiseDensity) {
-            noiseImg.pixels[i] = 0;
-            noiseImg.pixels[i + 1] = 0;
-            noiseImg.pixels[i + 2] = 0;
-            noiseImg.pixels[i + 3] = 128;
+            noiseTile.pixels[i] = 0;
+            noiseTile.pixels[i + 1] = 0;
+            noiseTile.pixels[i + 2] = 0;
+            noiseTile.pixels[i + 3] = 128;
         }
     }
-    noiseImg.updatePixels();
+    noiseTile.updatePixels();
+    noisePattern = drawingContext.createPattern(noiseTile.elt, 'repeat');
+}
+
+// Cover the canvas with the repeated noise tile
+function drawNoise() {
+    const ctx = drawingContext;
+    ctx.save();
+    ctx.fillStyle = noisePattern;
+    ctx.fillRect(0, 0, width, height);
+    ctx.restore();
 }
 
 // === COINS (Concentric Circles Around Carp) ===
 function initializeCoins() {
     allCoins = [];
+    if (!carpTetImg || !luckyCharmImg2) return; // Main stage still loading
     let cumulativeDelay = 0;
     const PER_COIN_DELAY = 40;
     const PAUSE_BETWEEN_CIRCLES = 400;
@@ -949,8 +1215,10 @@ class AnimatedCoin {
         rotate(this.targetAngle + PI / 2);
         imageMode(CENTER);
 
-        let imgWidth = this.img.width * this.targetScale;
-        let imgHeight = this.img.height * this.targetScale;
+        // Scale is relative to the original artwork, not the loaded tier
+        let size = artSize(this.img);
+        let imgWidth = size.w * this.targetScale;
+        let imgHeight = size.h * this.targetScale;
 
         // Glow circle behind coin
         noStroke();
@@ -965,21 +1233,41 @@ class AnimatedCoin {
 }
 
 // === BACKGROUND TEXT (Floating after wish submission) ===
+// Each text is rasterized once into a sprite; the floating texts share
+// textSpriteVariants styles and only blit their sprite every frame.
 function prepareBackgroundPattern(inputText) {
     backgroundTexts = [];
-    for (let i = 0; i < 120; i++) {   // increase the number of letters to cover evenly
+    clearTextSprites();
+
+    let styles = [];
+    for (let i = 0; i < textSpriteVariants; i++) {
         let txtRand = inputText;
         if (inputText.length > 1 && random() < 0.3) {
             let cut = int(random(1, inputText.length));
             txtRand = inputText.substring(0, cut);
         }
+        styles.push({ txt: txtRand, font: random(fontList), col: random(overlayColors), size: round(random(28, 120)) });
+    }
+
+    // Long wishes make wide sprites; lower the resolution of all of them
+    // together so their backing stores stay within maxSpritePixels
+    let area = 0;
+    const measured = new Set();
+    for (const s of styles) {
+        const key = textSpriteKey(s.txt, s.font, s.col, s.size);
+        if (measured.has(key)) continue;
+        measured.add(key);
+        const box = textSpriteBox(s.txt, s.font, s.size);
+        area += box.boxW * box.boxH;
+    }
+    const density = min(pixelDensity(), sqrt(maxSpritePixels / area));
+    const sprites = styles.map(s => getTextSprite(s.txt, s.font, s.col, s.size, density));
+
+    for (let i = 0; i < 120; i++) {   // increase the number of letters to cover evenly
         backgroundTexts.push({
             x: random(width),          // full screen
             y: random(height),         
-            color: color(random(overlayColors)),
-            font: random(fontList),
-            size: random(28, 120),
-            txt: txtRand,
+            sprite: random(sprites),
             alpha: 255,
             speed: random(0.5, 1.5),
             exploded: false            // flag on hover to disintegrate
@@ -987,6 +1275,48 @@ function prepareBackgroundPattern(inputText) {
     }
 }
 
+function textSpriteKey(txt, font, col, size) {
+    return `${fontList.indexOf(font)}|${col}|${size}|${txt}`;
+}
+
+// Text width and sprite box of txt, in canvas pixels
+function textSpriteBox(txt, font, size) {
+    push();
+    textFont(font);
+    textSize(size);
+    const w = textWidth(txt);
+    pop();
+
+    // Padding for glyphs that overhang their advance width (script fonts)
+    return { w, boxW: ceil(w + size), boxH: ceil(size * 1.6) };
+}
+
+// Rasterize txt once per font/colour/size and cache it with its bounds
+function getTextSprite(txt, font, col, size, density) {
+    const key = textSpriteKey(txt, font, col, size);
+    let sprite = textSprites.get(key);
+    if (sprite) return sprite;
+
+    const { w, boxW, boxH } = textSpriteBox(txt, font, size);
+    const g = createGraphics(boxW, boxH);
+    g.pixelDensity(min(density, maxSpriteWidth / boxW));
+    g.textFont(font);
+    g.textSize(size);
+    g.textAlign(CENTER, CENTER);
+    g.noStroke();
+    g.fill(col);
+    g.text(txt, boxW / 2, boxH / 2);
+
+    sprite = { canvas: g.elt, graphics: g, w, size, boxW, boxH };
+    textSprites.set(key, sprite);
+    return sprite;
+}
+
+function clearTextSprites() {
+    textSprites.forEach(sprite => sprite.graphics.remove());
+    textSprites.clear();
+}
+
 
 // === FLYING ASSETS (during tower transition) ===
 class FlyingAsset {
@@ -1007,7 +1337,7 @@ class FlyingAsset {
             this.y -= this.speed;
             this.alpha = min(255, this.alpha + 2);
 
-            if (this.y < -this.img.height * this.initialScale) {
+            if (this.y < -artSize(this.img).h * this.initialScale) {
                 this.y = height + random(20, 200);
                 this.x = random(width);
                 this.alpha = 0;
@@ -1025,7 +1355,8 @@ class FlyingAsset {
         translate(this.x, this.y);
         rotate(this.rotation);
         imageMode(CENTER);
-        image(this.img, 0, 0, this.img.width * currentScale, this.img.height * currentScale);
+        let size = artSize(this.img);
+        image(this.img, 0, 0, size.w * currentScale, size.h * currentScale);
         pop();
     }
 }
@@ -1033,7 +1364,9 @@ class FlyingAsset {
 // Initialize all flying assets (joss paper, coins, charms)
 function initializeFlyingAssets() {
     flyingAssets = [];
-    const images = [coinImg, josspaperImg1, josspaperImg2, josspaperImg3, josspaperImg4, charmImg1, charmImg2];
+    // Images that failed to load are skipped
+    const images = [coinImg, josspaperImg1, josspaperImg2, josspaperImg3, josspaperImg4, charmImg1, charmImg2]
+        .filter(Boolean);
     const numAssets = 150;
     const baseScale = width / baseWidth;
 
@@ -1103,18 +1436,18 @@ function resetSketch() {
 
   userWish = "";
   backgroundTexts = [];
+  clearTextSprites();
   flyingAssets = [];
   allCoins = [];
   flowerClusters = [];
 
   // reset âm thanh nếu cần
-  if (heavenSound && heavenSound.isPlaying()) heavenSound.stop();
-  if (knockingWoodenFishSound && knockingWoodenFishSound.isPlaying()) knockingWoodenFishSound.stop();
-  if (ambienceSound && ambienceSound.isPlaying()) ambienceSound.stop();
+  heavenSound.stop();
+  knockingWoodenFishSound.stop();
+  ambienceSound.stop();
 
   carpCurrentScale = 0.1;
   initializeCoins();
-  generateNoiseTexture();
 
   resetBox.hide();
   sliderBox.hide();
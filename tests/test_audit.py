@@ -0,0 +1,68 @@
+import pytest
+
+from tools import audit
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head></head>
+<body>
+  <section class="hero"><img src="hero.png" alt="" width="10" height="10"></section>
+  <picture>
+    <source type="image/webp" srcset="below-400.webp 400w, below-800.webp 800w" sizes="400px">
+    <img src="below.png" alt="">
+  </picture>
+</body>
+</html>
+"""
+
+
+def run(tmp_path, files):
+    for rel, data in files.items():
+        (tmp_path / rel).write_bytes(data)
+    return audit.PageAudit(audit.Site(tmp_path), "index.html").run()
+
+
+def test_offscreen_images_report_the_candidate_the_browser_downloads(tmp_path):
+    result = run(tmp_path, {
+        "index.html": PAGE.encode(),
+        "hero.png": b"h" * 10,
+        "below.png": b"p" * 5000,
+        "below-400.webp": b"4" * 2048,
+        "below-800.webp": b"8" * 4096,
+    })
+    issues = {i["kind"]: i for i in result["issues"]}
+    eager = issues["eager-offscreen"]
+    assert eager["url"] == "below-400.webp"
+    assert eager["bytes"] == 2048
+    assert "2.0 kB" in eager["detail"]
+    assert issues["no-dimensions"]["url"] == "below-400.webp"
+    assert "hero.png" not in [i["url"] for i in result["issues"]]
+
+
+def test_missing_candidates_fall_back_to_the_referenced_url(tmp_path):
+    result = run(tmp_path, {"index.html": PAGE.encode(), "hero.png": b"h"})
+    kinds = {(i["kind"], i["url"]) for i in result["issues"]}
+    assert ("missing", "below-400.webp") in kinds
+    assert ("eager-offscreen", "below-400.webp") in kinds
+
+
+@pytest.mark.parametrize("sizes, width", [
+    (None, 1920),
+    ("100vw", 1920),
+    ("50vw", 960),
+    ("34vh", 367.2),
+    ("(max-width: 576px) 301px, 600px", 600),
+    ("(max-width: 576px) 90px, (max-width: 1024px) 100vw, 168px", 168),
+    ("(min-width: 1025px) 25vw, 100vw", 480),
+])
+def test_rendered_width_at_the_desktop_viewport(sizes, width):
+    assert audit.rendered_width(sizes) == pytest.approx(width)
+
+
+def test_report_is_written_outside_the_audited_tree(tmp_path):
+    assert audit.DIST not in audit.REPORT.parents
+    (tmp_path / "index.html").write_text("<html></html>")
+    with pytest.raises(SystemExit) as exited:
+        audit.main(["--root", str(tmp_path), "--report", str(tmp_path / "r.json")])
+    assert "would be published" in str(exited.value)
+    assert not (tmp_path / "r.json").exists()
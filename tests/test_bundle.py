@@ -0,0 +1,135 @@
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from tools import bundle, markup
+
+PAGE = """<!DOCTYPE html>
+<html lang="vi">
+<head>
+  <meta charset="UTF-8">
+  <link rel="stylesheet" href="css/style.css">
+  <link rel="stylesheet" href="css/extra.css">
+  <script src="https://cdn.example/lib.js"></script>
+</head>
+<body>
+  <section class="hero"><img src="assets/logo.png" alt=""></section>
+  <section class="below"><p class="note">text</p></section>
+  <script src="js/a.js"></script>
+  <script src="js/b.js"></script>
+  <script>boot();</script>
+</body>
+</html>
+"""
+
+STYLE = """
+@import url('https://fonts.example/css?family=X');
+.hero { background: url('../assets/bg.png'); }
+.below { color: blue; }
+.never { color: red; }
+@media (max-width: 576px) { .hero { padding: 0 } .note { margin: 0 } }
+"""
+
+
+@pytest.fixture
+def site(tmp_path):
+    root, dist = tmp_path / "src", tmp_path / "dist"
+    files = {
+        "index.html": PAGE,
+        "css/style.css": STYLE,
+        "css/extra.css": ".note { font-size: 2em } .is-open { display: block }",
+        "js/a.js": "// first\nfunction boot() { menu.classList.add('is-open'); }\n",
+        "js/b.js": "const late = 1;\n",
+        "assets/logo.png": "png",
+        "assets/bg.png": "png",
+    }
+    for rel, text in files.items():
+        for base in (root, dist):
+            (base / rel).parent.mkdir(parents=True, exist_ok=True)
+            (base / rel).write_text(text)
+    return bundle.Bundler(root, dist)
+
+
+def rewrite(site):
+    return bundle.rewrite_page(PAGE, "index.html", site)
+
+
+def inline_style(html):
+    return re.search(r"<style>(.*?)</style>", html).group(1)
+
+
+def bundled(site, html, kind):
+    url = re.search(r'(?:href|src)="(%s/bundle\.[0-9a-f]+\.%s)"' % (kind, kind), html).group(1)
+    return (site.dist / url).read_text()
+
+
+def test_critical_css_only_has_rules_above_the_fold(site):
+    style = inline_style(rewrite(site))
+    assert ".hero{background:url('assets/bg." in style
+    assert "@media (max-width:576px){.hero{padding:0}}" in style
+    assert ".below" not in style and ".note" not in style and ".never" not in style
+
+
+def test_full_bundle_is_pruned_rebased_and_loaded_async(site):
+    html = rewrite(site)
+    css = bundled(site, html, "css")
+    assert ".below{color:blue}" in css and ".note{font-size:2em}" in css
+    assert ".is-open{display:block}" in css  # added from a.js
+    assert ".never" not in css
+    assert "url('../assets/bg.png')" in css
+    href = re.search(r'href="(css/bundle\.[0-9a-f]+\.css)"', html).group(1)
+    assert bundle.ASYNC_STYLESHEET % (href, href) in html
+    # The only stylesheet links left are the <noscript> fallbacks
+    assert 'rel="stylesheet"' not in re.sub(r"<noscript>.*?</noscript>", "", html)
+    assert "css/style.css" not in html and "css/extra.css" not in html
+
+
+def test_imports_become_async_links(site):
+    url = "https://fonts.example/css?family=X"
+    assert bundle.ASYNC_STYLESHEET % (url, url) in rewrite(site)
+
+
+def test_scripts_are_bundled_and_everything_is_deferred(site):
+    html = rewrite(site)
+    tags = [m.group(0) for m in markup.find_tags(html, "script") if not m.group(1)]
+    assert tags[0] == '<script src="https://cdn.example/lib.js" defer>'
+    assert re.fullmatch(r'<script src="js/bundle\.[0-9a-f]+\.js" defer>', tags[1])
+    assert len(tags) == 2
+    code = bundled(site, html, "js")
+    assert "first" not in code and "boot();" in code
+
+
+def test_local_assets_are_fingerprinted(site):
+    html = rewrite(site)
+    logo = re.search(r'<img src="([^"]+)"', html).group(1)
+    assert bundle.FINGERPRINT_RE.search(logo)
+    assert (site.dist / logo).read_text() == "png"
+
+
+def test_rewrite_is_deterministic(site):
+    assert rewrite(site) == rewrite(site)
+
+
+def test_join_scripts_isolates_files_unless_their_bindings_are_shared():
+    code = bundle.join_scripts(["const Shared = 1;", "let own = Shared;", "'use strict';\nx();", "y();"])
+    parts = code.split("\n;")
+    assert parts[0] == "const Shared=1;\n"
+    assert parts[1].startswith("try{") and "let own=Shared;" in parts[1]
+    assert parts[2] == "'use strict';\nx();\n"
+    assert parts[3].startswith("try{")
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_a_failing_file_does_not_stop_the_rest():
+    code = bundle.join_scripts([
+        "const Registry = [];",
+        "Registry.push('a');\nfunction setup() { return Registry.length; }\nnew MissingLibrary();",
+        "Registry.push('b');",
+        "console.log(JSON.stringify([Registry, typeof setup]));",
+    ])
+    out = subprocess.run(["node", "-e", code], capture_output=True, text=True, timeout=30)
+    assert out.returncode == 0
+    assert out.stdout.strip() == '[["a","b"],"function"]'
+    assert "MissingLibrary is not defined" in out.stderr
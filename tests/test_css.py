@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+from tools import css
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def usage(html="", script=""):
+    u = css.Usage()
+    u.add_html(html)
+    u.add_script(script)
+    return u
+
+
+def pruned(text, html="", script=""):
+    return css.serialize(css.prune(css.parse(text), usage(html, script)))
+
+
+def test_prune_drops_selectors_the_page_never_matches():
+    out = pruned(".card, .ghost { color: red } #main p { margin: 0 } .ghost { top: 0 }",
+                 html='<div id="main" class="card"><p>x</p></div>')
+    assert out == ".card{color:red}#main p{margin:0}"
+
+
+def test_prune_keeps_classes_added_from_scripts():
+    out = pruned(".is-open { display: block } .never { display: none }",
+                 script="menu.classList.add('is-open')")
+    assert out == ".is-open{display:block}"
+
+
+def test_prune_keeps_template_literal_prefixes():
+    text = ".stagger-1 { delay: 1s } .stagger-6 { delay: 6s } .other-1 { delay: 0 }"
+    out = pruned(text, script="el.classList.add(`stagger-${Math.min(i + 1, 6)}`)")
+    assert out == ".stagger-1{delay:1s}.stagger-6{delay:6s}"
+
+
+def test_prune_ignores_pseudo_classes_and_attribute_selectors():
+    out = pruned("a:hover::after, .btn[data-x='1']:not(.off) { color: red }", html='<a class="btn">')
+    assert out == "a:hover::after,.btn[data-x='1']:not(.off){color:red}"
+
+
+def test_prune_drops_empty_media_blocks():
+    out = pruned("@media (max-width: 576px) { .ghost { top: 0 } } @media print { body { margin: 0 } }",
+                 html="<body>")
+    assert out == "@media print{body{margin:0}}"
+
+
+def test_prune_drops_keyframes_nothing_animates():
+    text = """
+    .spin { animation: rotate 2s linear infinite, pulse 1s; }
+    @keyframes rotate { from { transform: rotate(0) } to { transform: rotate(1turn) } }
+    @keyframes pulse { 50% { opacity: .5 } }
+    @keyframes orphan { to { opacity: 0 } }
+    @-webkit-keyframes fromScript { to { opacity: 1 } }
+    """
+    out = pruned(text, html='<i class="spin">', script="el.style.animationName = 'fromScript'")
+    assert "@keyframes rotate{" in out
+    assert "@keyframes pulse{" in out
+    assert "orphan" not in out
+    assert "@-webkit-keyframes fromScript{" in out
+
+
+def test_prune_drops_keyframes_used_only_by_pruned_rules():
+    text = ".ghost { animation-name: fade } @keyframes fade { to { opacity: 0 } }"
+    assert pruned(text) == ""
+
+
+def test_imports_are_collected_and_not_serialized():
+    nodes = css.parse("@import url('https://fonts.example/css?family=A;B');\n"
+                      "@import \"local.css\";\nbody { margin: 0 }")
+    assert css.imports(nodes) == ["https://fonts.example/css?family=A;B", "local.css"]
+    assert pruned("@import 'x.css'; body { margin: 0 }", html="<body>") == "body{margin:0}"
+
+
+def test_serialize_minifies_without_touching_strings():
+    text = """
+    /* comment { with braces } */
+    .a > .b ,  .c + .d ~ .e {
+      content: "  spaced ; {braces}  ";
+      font-family: 'Cormorant Garamond' , serif ;
+      margin : 0  auto !important;
+      background: url( "../img/a b.png" ) no-repeat;
+      width: calc(100% - ( 2 * 10px ));
+    }
+    @media (max-width: 576px) and (orientation : portrait) { .a { top: 0 } }
+    @font-face { font-family: "X"; src: url(x.woff2) format("woff2"); }
+    """
+    assert css.serialize(css.parse(text)) == (
+        '.a>.b,.c+.d~.e{content:"  spaced ; {braces}  ";'
+        "font-family:'Cormorant Garamond',serif;"
+        "margin:0 auto!important;"
+        'background:url("../img/a b.png") no-repeat;'
+        "width:calc(100% - (2 * 10px))}"
+        "@media (max-width:576px) and (orientation:portrait){.a{top:0}}"
+        '@font-face{font-family:"X";src:url(x.woff2) format("woff2")}'
+    )
+
+
+def test_serialize_keeps_keyframe_steps():
+    text = "@keyframes k { 0%, 50% { opacity: 0 } to { opacity: 1 } }"
+    assert css.serialize(css.parse(text)) == "@keyframes k{0%,50%{opacity:0}to{opacity:1}}"
+
+
+@pytest.mark.parametrize("sheet", sorted(p.name for p in (ROOT / "css").glob("*.css")))
+def test_serialize_round_trips_the_site_stylesheets(sheet):
+    once = css.serialize(css.parse((ROOT / "css" / sheet).read_text(encoding="utf-8")))
+    assert css.serialize(css.parse(once)) == once
+
+
+def test_rebase_urls_follows_the_new_location():
+    nodes = css.parse(".a { background: url('../assets/x.png') } .b { background: url(data:image/png;base64,AA) }"
+                      " .c { background: url(https://cdn.example/y.png) }")
+    out = css.serialize(css.rebase_urls(nodes, "css/style.css", "index.html"))
+    assert out == (".a{background:url('assets/x.png')}"
+                   ".b{background:url(data:image/png;base64,AA)}"
+                   ".c{background:url(https://cdn.example/y.png)}")
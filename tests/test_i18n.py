@@ -0,0 +1,130 @@
+import re
+
+import pytest
+
+from tools import i18n, markup
+
+PAGE = """<!DOCTYPE html>
+<html lang="vi">
+<head>
+  <meta charset="UTF-8">
+  <title>Trang</title>
+  <link rel="stylesheet" href="../css/style.css">
+</head>
+<body class="page lang-vi">
+  <h1 data-vi="Xin chào" data-en="Hello &amp; welcome">Xin chào</h1>
+  <p>Không dịch</p>
+</body>
+</html>
+"""
+
+
+def en(html):
+    return i18n.translate(html, "en")
+
+
+def test_default_language_is_left_as_authored():
+    assert i18n.translate(PAGE, "vi") == PAGE
+
+
+def test_text_is_replaced_and_escaped():
+    out = en('<h1 class="t" data-vi="Xin chào" data-en="Tom &amp; <Jerry>">Xin chào</h1>')
+    assert out == '<h1 class="t" data-vi="Xin chào" data-en="Tom &amp; <Jerry>">Tom &amp; &lt;Jerry&gt;</h1>'
+
+
+def test_elements_need_both_languages():
+    src = '<p data-en="Only English">Chỉ tiếng Việt</p><p data-vi="Chỉ">Chỉ</p>'
+    assert en(src) == src
+
+
+def test_nested_bilingual_elements_are_replaced_by_the_outer_translation():
+    src = ('<div data-vi="A" data-en="Outer"><span data-vi="B" data-en="Inner">B</span> A</div>'
+           '<span data-vi="C" data-en="After">C</span>')
+    assert en(src) == ('<div data-vi="A" data-en="Outer">Outer</div>'
+                       '<span data-vi="C" data-en="After">After</span>')
+
+
+def test_same_name_descendants_are_balanced():
+    src = '<p data-vi="X" data-en="Y"><p>a</p><p>b</p></p><p>tail</p>'
+    assert en(src) == '<p data-vi="X" data-en="Y">Y</p><p>tail</p>'
+
+
+def test_similar_tag_names_are_not_counted():
+    src = '<p data-vi="X" data-en="Y"><param name="a"><p-card>z</p-card></p>'
+    assert en(src) == '<p data-vi="X" data-en="Y">Y</p>'
+
+
+def test_void_and_self_closing_tags_are_skipped():
+    src = ('<img src="a.png" data-vi="Ảnh" data-en="Image">'
+           '<input data-vi="Tên" data-en="Name" />'
+           '<span data-vi="V" data-en="E"/>'
+           '<b data-vi="Đậm" data-en="Bold">Đậm<br/><hr></b>')
+    assert en(src) == ('<img src="a.png" data-vi="Ảnh" data-en="Image">'
+                       '<input data-vi="Tên" data-en="Name" />'
+                       '<span data-vi="V" data-en="E"/>'
+                       '<b data-vi="Đậm" data-en="Bold">Bold</b>')
+
+
+def test_self_closing_descendants_do_not_unbalance_the_element():
+    src = '<span data-vi="V" data-en="E">V<span class="x"/></span><span>keep</span>'
+    assert en(src) == '<span data-vi="V" data-en="E">E</span><span>keep</span>'
+
+
+def test_unclosed_element_is_an_error():
+    with pytest.raises(ValueError):
+        en('<p data-vi="X" data-en="Y">never closed')
+
+
+def test_variant_page_names():
+    assert i18n.variant_page("index.html", "vi") == "index.html"
+    assert i18n.variant_page("pages/a.html", "en") == "pages/a.en.html"
+
+
+def test_pages_without_translations_have_one_variant():
+    html = "<html><head></head><body><p>x</p></body></html>"
+    assert i18n.variants(html, "about.html") == [("about.html", html)]
+
+
+def test_variants_are_written_for_every_language():
+    pages = dict(i18n.variants(PAGE, "pages/a.html"))
+    assert list(pages) == ["pages/a.html", "pages/a.en.html"]
+    assert "<h1 data-vi=\"Xin chào\" data-en=\"Hello &amp; welcome\">Hello &amp; welcome</h1>" in pages["pages/a.en.html"]
+    assert ">Xin chào</h1>" in pages["pages/a.html"]
+
+
+@pytest.mark.parametrize("lang", i18n.LANGUAGES)
+def test_lang_attribute_and_body_class(lang):
+    out = i18n.compile_page(PAGE, "index.html", lang)
+    assert '<html lang="%s">' % lang in out
+    assert '<body class="page lang-%s">' % lang in out
+
+
+@pytest.mark.parametrize("page, urls", [
+    ("index.html", {"vi": "index.html", "en": "index.en.html"}),
+    ("pages/a.html", {"vi": "a.html", "en": "a.en.html"}),
+])
+def test_hreflang_alternates_cover_every_language(page, urls):
+    out = i18n.compile_page(PAGE, page, "en")
+    links = [markup.parse_attrs(m.group(3)) for m in markup.find_tags(out, "link")]
+    alternates = {markup.get_attr(a, "hreflang"): markup.get_attr(a, "href")
+                  for a in links if markup.get_attr(a, "rel") == "alternate"}
+    assert alternates == urls
+
+
+def test_redirect_runs_right_after_the_charset():
+    out = i18n.compile_page(PAGE, "index.html", "en")
+    head = out[out.index("<head>"):out.index("</head>")]
+    charset = head.index('<meta charset="UTF-8">')
+    script = head.index("<script>")
+    assert charset < script < head.index("<title>") < head.index('rel="stylesheet"')
+    assert head[charset:script].count("<") == 3  # meta and the two alternates
+    body = re.search(r"<script>(.*?)</script>", head).group(1)
+    assert body == i18n.REDIRECT_JS % (i18n.STORAGE_KEY, "vi:'index.html',en:'index.en.html'", "en")
+
+
+def test_redirect_goes_first_in_head_without_a_charset():
+    html = '<html><head data-x="1"><title>t</title></head><body><p data-vi="a" data-en="b">a</p></body></html>'
+    out = i18n.compile_page(html, "index.html", "vi")
+    assert out.startswith('<html lang="vi"><head data-x="1">\n  <link rel="alternate" hreflang="vi"')
+    with pytest.raises(ValueError):
+        i18n.compile_page("<p>no head</p>", "index.html", "en")
@@ -0,0 +1,133 @@
+import re
+
+import pytest
+from PIL import Image
+
+from tools import images, markup
+
+
+def save(path, size, color):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", size, color).save(path)
+
+
+@pytest.fixture
+def site(tmp_path):
+    root, dist = tmp_path / "src", tmp_path / "dist"
+    save(root / "assets/images/photo.png", (700, 350), "red")
+    save(root / "assets/images/icon.png", (100, 50), "blue")
+    save(root / "sketch/code/asset/photo-copy.png", (700, 350), "red")
+    return root, dist
+
+
+def build(site):
+    root, dist = site
+    return images.build_images(root, dist, jobs=1)
+
+
+def widths(srcset):
+    return [int(candidate.split()[1][:-1]) for candidate in srcset.split(", ")]
+
+
+def test_tiers_stop_at_the_source_width():
+    assert images.tier_widths(700) == [160, 320, 640, 700]
+    assert images.tier_widths(100) == [100]
+    assert images.tier_widths(4000) == list(images.WIDTHS)
+
+
+def test_duplicate_sources_share_one_set_of_variants(site, capsys):
+    manifest = build(site)
+    assert manifest.lookup("assets/images/photo.png") is manifest.lookup("sketch/code/asset/photo-copy.png")
+    assert len(manifest.images) == 2
+    assert "3 sources, 2 unique, 1 duplicates, 2 encoded" in capsys.readouterr().out
+    entry = manifest.lookup("assets/images/photo.png")
+    assert (entry["width"], entry["height"]) == (700, 350)
+    assert all((site[1] / path).is_file() for path in manifest.outputs(entry))
+
+
+def test_unchanged_sources_are_not_encoded_again(site, capsys):
+    build(site)
+    manifest_path = site[1] / images.OUTPUT_DIR / images.MANIFEST_NAME
+    before = manifest_path.stat().st_mtime_ns
+    capsys.readouterr()
+    build(site)
+    assert "0 encoded" in capsys.readouterr().out
+    assert manifest_path.stat().st_mtime_ns == before
+
+
+def test_changed_sources_are_encoded_and_stale_variants_removed(site, capsys):
+    old = build(site).lookup("assets/images/icon.png")
+    save(site[0] / "assets/images/icon.png", (100, 50), "green")
+    capsys.readouterr()
+    new = build(site).lookup("assets/images/icon.png")
+    assert "1 encoded" in capsys.readouterr().out
+    assert new["fallback"] != old["fallback"]
+    assert not any((site[1] / path).exists() for path in images.Manifest(site[1]).outputs(old))
+    assert (site[1] / images.OUTPUT_DIR / images.MANIFEST_NAME).is_file()
+
+
+def test_img_is_wrapped_in_a_picture_with_its_sizes(site):
+    manifest = build(site)
+    html = images.rewrite_page('<p><img src="assets/images/photo.png" sizes="50vw" alt="x"></p>',
+                               "index.html", manifest)
+    match = re.fullmatch(r"<p><picture>(.*)(<img [^>]*>)</picture></p>", html)
+    assert match
+    sources = list(markup.find_tags(match.group(1), "source"))
+    assert len(sources) == len(manifest.formats(manifest.lookup("assets/images/photo.png")))
+    for source in sources:
+        attrs = markup.parse_attrs(source.group(3))
+        assert markup.get_attr(attrs, "sizes") == "50vw"
+        assert widths(markup.get_attr(attrs, "srcset")) == [160, 320, 640, 700]
+    attrs = markup.parse_attrs(match.group(2)[len("<img"):-1])
+    assert markup.get_attr(attrs, "src").endswith("-700.png")
+    assert markup.get_attr(attrs, "sizes") == "50vw"
+    assert markup.get_attr(attrs, "alt") == "x"
+
+
+def test_img_without_sizes_is_full_width(site):
+    html = images.rewrite_page('<img src="assets/images/photo.png">', "index.html", build(site))
+    assert 'sizes="%s"' % images.DEFAULT_SIZES in html
+
+
+def test_urls_are_relative_to_the_page(site):
+    html = images.rewrite_page('<img src="../assets/images/icon.png">', "pages/a.html", build(site))
+    assert 'src="../assets/img/icon.' in html
+
+
+def test_intrinsic_dimensions_are_added_unless_authored(site):
+    manifest = build(site)
+    html = images.rewrite_page('<img src="assets/images/photo.png">', "index.html", manifest)
+    assert 'width="700" height="350"' in html
+    html = images.rewrite_page('<img src="assets/images/photo.png" width="70">', "index.html", manifest)
+    assert 'width="70"' in html and "height=" not in html
+
+
+def test_existing_picture_is_not_wrapped_again(site):
+    page = ('<picture><source media="(max-width: 576px)" srcset="m.png">'
+            '<img src="assets/images/icon.png" sizes="40px"></picture>')
+    html = images.rewrite_page(page, "index.html", build(site))
+    assert html.count("<picture>") == 1
+    assert html.startswith('<picture><source media="(max-width: 576px)" srcset="m.png"><img ')
+    assert 'srcset="assets/img/icon.' in html and 'sizes="40px"' in html
+
+
+def test_preload_points_at_the_preferred_format(site):
+    manifest = build(site)
+    entry = manifest.lookup("assets/images/photo.png")
+    html = images.rewrite_page('<link rel="preload" href="assets/images/photo.png" as="image" imagesizes="50vw">',
+                               "index.html", manifest)
+    attrs = markup.parse_attrs(next(markup.find_tags(html, "link")).group(3))
+    best = manifest.formats(entry)[0] if manifest.formats(entry) else None
+    variants = entry["variants"][best] if best else entry["fallback"]
+    assert markup.get_attr(attrs, "href") == variants[-1][1]
+    assert widths(markup.get_attr(attrs, "imagesrcset")) == [160, 320, 640, 700]
+    assert markup.get_attr(attrs, "imagesizes") == "50vw"
+    if best:
+        assert markup.get_attr(attrs, "type") == images.FORMATS[best][0]
+
+
+def test_other_links_and_unknown_images_are_left_alone(site):
+    page = ('<link rel="preload" href="assets/images/photo.png" as="fetch">'
+            '<link rel="icon" href="assets/images/icon.png">'
+            '<img src="assets/images/missing.png"><img src="https://cdn.example/x.png">')
+    assert images.rewrite_page(page, "index.html", build(site)) == page
@@ -0,0 +1,99 @@
+import shutil
+import subprocess
+
+import pytest
+
+from tools import js
+
+node = pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+
+
+def run(code):
+    result = subprocess.run(["node", "-e", code], capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_comments_and_indentation_are_removed():
+    src = """
+    // leading comment
+    function add(a, b) {
+        /* block
+           comment */
+        return a + b;   // trailing
+    }
+    """
+    assert js.minify(src) == "function add(a,b){\nreturn a+b;\n}\n"
+
+
+def test_line_breaks_are_kept_for_asi():
+    src = "let a = 1\nlet b = a\n++b\nconst c = () => {}\n[1, 2].forEach(f)\n"
+    assert js.minify(src) == "let a=1\nlet b=a\n++b\nconst c=()=>{}\n[1,2].forEach(f)\n"
+
+
+def test_return_followed_by_newline_is_not_joined():
+    assert js.minify("function f() {\n  return\n  1\n}") == "function f(){\nreturn\n1\n}\n"
+
+
+def test_unary_operators_keep_their_space():
+    assert js.minify("a = b + +c - -d + ++e") == "a=b+ +c- -d+ ++e\n"
+
+
+def test_comment_markers_inside_strings_are_text():
+    src = "const s = '// not a comment', t = \"/* nor this */\", u = 'it\\'s';"
+    assert js.minify(src) == "const s='// not a comment',t=\"/* nor this */\",u='it\\'s';\n"
+
+
+def test_template_literals_are_kept_verbatim():
+    template = "`a  /* b */\n  ${ x ? '}' : `${y / 2}` }  // c`"
+    assert js.minify("const t = %s;" % template) == "const t=%s;\n" % template
+
+
+@pytest.mark.parametrize("src, expected", [
+    ("const re = /\\/\\/ [/*]/g;", "const re=/\\/\\/ [/*]/g;"),
+    ("if (/^\\d+$/.test(s)) x = 1;", "if(/^\\d+$/.test(s))x=1;"),
+    ("return /a\\/b  c/.source;", "return/a\\/b  c/.source;"),
+    ("f(a, /=/, /[\\]/]+/i);", "f(a,/=/,/[\\]/]+/i);"),
+    ("x = cond ? /y z/ : /z/;", "x=cond?/y z/:/z/;"),
+])
+def test_regex_literals_are_kept_verbatim(src, expected):
+    assert js.minify(src) == expected + "\n"
+
+
+def test_division_is_not_a_regex():
+    assert js.minify("x = a / b / c; y = (a) / 2 /* half */; z = arr[0] / 4") == "x=a/b/c;y=(a)/2;z=arr[0]/4\n"
+
+
+@node
+def test_minified_code_behaves_the_same():
+    src = r"""
+    const log = [];
+    let a = 1
+    let b = a
+    ++b
+    const words = 'a // b /* c */'.split(/\s+\/\/\s+|\s/);
+    const half = b / 2 / 1;
+    const tpl = `x ${ [1, 2].map(n => `${n}}`).join('') } // y`;
+    const neg = a - -b + +'3';
+    function f() {
+      return    // ASI: returns undefined
+        42
+    }
+    log.push(words, half, tpl, neg, f(), /[/]\//.test('//'));
+    console.log(JSON.stringify(log));
+    """
+    assert run(js.minify(src)) == run(src)
+
+
+def test_top_level_bindings():
+    src = """
+    const A = 1, B = { c: 2 }
+    let d = [1, 2], e
+    class F {}
+    var notLexical = 1;
+    function g() { const inner = 1; let other; }
+    if (x) { const blockScoped = 1; }
+    const s = 'const fake = 1;';
+    const r = /let nope/;
+    """
+    assert js.top_level_bindings(src) == {"A", "B", "d", "e", "F", "s", "r"}
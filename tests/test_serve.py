@@ -0,0 +1,187 @@
+import gzip
+import http.client
+import json
+
+import pytest
+
+from tools import serve
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", True),
+    ("GZIP;Q=1", True),
+    ("br, gzip;q=0.5", True),
+    ("x-gzip", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, deflate", False),
+    ("gzip;q=0, *", False),
+    ("*;q=0", False),
+    ("identity", False),
+    ("", False),
+])
+def test_accepts_gzip(header, expected):
+    assert serve.accepts_gzip(header) is expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=90-", (90, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=50-1000", (50, 99)),
+    ("bytes=-0", None),
+    ("bytes=100-", None),
+    ("bytes=9-3", None),
+])
+def test_parse_range(header, expected):
+    assert serve.parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=0-1,5-6", "items=0-1", "bytes=-"])
+def test_parse_range_rejects_unsupported_ranges(header):
+    with pytest.raises(ValueError):
+        serve.parse_range(header, 100)
+
+
+BIG = bytes(range(256)) * 400  # over SENDFILE_THRESHOLD
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    root = tmp_path_factory.mktemp("dist")
+    (root / "index.html").write_text("<!DOCTYPE html><p>home</p>" + " " * 200)
+    (root / "index.html.gz").write_bytes(gzip.compress((root / "index.html").read_bytes()))
+    (root / "app.0123456789.js").write_text("console.log(1);\n")
+    (root / "song.ogg").write_bytes(BIG)
+    (root / "pages").mkdir()
+    (root / "pages" / "index.html").write_text("<p>pages</p>")
+    (root.parent / "secret.txt").write_text("outside")
+    thread = serve.ServerThread(root)
+    yield thread
+    thread.stop()
+
+
+def get(server, path, method="GET", **headers):
+    conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    try:
+        conn.request(method, path, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+    finally:
+        conn.close()
+
+
+def test_pages_are_revalidated_and_tagged(server):
+    response, body = get(server, "/")
+    assert response.status == 200
+    assert body.startswith(b"<!DOCTYPE html>")
+    assert response.getheader("Cache-Control") == serve.CACHE_PAGE
+    assert response.getheader("Content-Type") == "text/html; charset=utf-8"
+    assert response.getheader("ETag").startswith('"')
+    assert response.getheader("Content-Encoding") is None
+
+
+def test_fingerprinted_files_are_immutable(server):
+    response, _ = get(server, "/app.0123456789.js")
+    assert response.getheader("Cache-Control") == serve.CACHE_IMMUTABLE
+
+
+def test_directories_serve_their_index(server):
+    assert get(server, "/pages/")[1] == b"<p>pages</p>"
+
+
+@pytest.mark.parametrize("accept, gzipped", [
+    ("gzip, deflate", True),
+    ("br;q=1, gzip;q=0.5", True),
+    ("gzip;q=0", False),
+    ("gzip;q=0, *", False),
+    ("identity", False),
+])
+def test_precompressed_copy_follows_accept_encoding(server, accept, gzipped):
+    response, body = get(server, "/index.html", **{"Accept-Encoding": accept})
+    assert response.getheader("Vary") == "Accept-Encoding"
+    if gzipped:
+        assert response.getheader("Content-Encoding") == "gzip"
+        assert gzip.decompress(body).startswith(b"<!DOCTYPE html>")
+    else:
+        assert response.getheader("Content-Encoding") is None
+        assert body.startswith(b"<!DOCTYPE html>")
+
+
+def test_gzip_and_identity_have_different_etags(server):
+    plain, _ = get(server, "/index.html")
+    packed, _ = get(server, "/index.html", **{"Accept-Encoding": "gzip"})
+    assert plain.getheader("ETag") != packed.getheader("ETag")
+
+
+def test_matching_validators_get_304(server):
+    first, _ = get(server, "/index.html", **{"Accept-Encoding": "gzip"})
+    response, body = get(server, "/index.html", **{"Accept-Encoding": "gzip", "If-None-Match": first.getheader("ETag")})
+    assert response.status == 304 and body == b""
+    assert response.getheader("ETag") == first.getheader("ETag")
+    response, _ = get(server, "/index.html", **{"If-Modified-Since": first.getheader("Last-Modified")})
+    assert response.status == 304
+    response, _ = get(server, "/index.html", **{"If-None-Match": '"stale"'})
+    assert response.status == 200
+
+
+@pytest.mark.parametrize("header, first, last", [
+    ("bytes=0-99", 0, 99),
+    ("bytes=100000-", 100000, len(BIG) - 1),
+    ("bytes=-10", len(BIG) - 10, len(BIG) - 1),
+    ("bytes=10-70000", 10, 70000),  # large enough for sendfile
+])
+def test_ranges_get_206(server, header, first, last):
+    response, body = get(server, "/song.ogg", Range=header)
+    assert response.status == 206
+    assert response.getheader("Content-Range") == "bytes %d-%d/%d" % (first, last, len(BIG))
+    assert body == BIG[first:last + 1]
+
+
+def test_unsatisfiable_range_gets_416(server):
+    response, _ = get(server, "/song.ogg", Range="bytes=%d-" % len(BIG))
+    assert response.status == 416
+    assert response.getheader("Content-Range") == "bytes */%d" % len(BIG)
+
+
+def test_stale_if_range_gets_the_whole_file(server):
+    response, body = get(server, "/song.ogg", Range="bytes=0-9", **{"If-Range": '"stale"'})
+    assert response.status == 200 and body == BIG
+
+
+def test_ranges_are_served_uncompressed(server):
+    response, body = get(server, "/index.html", Range="bytes=0-14", **{"Accept-Encoding": "gzip"})
+    assert response.status == 206
+    assert response.getheader("Content-Encoding") is None
+    assert body == b"<!DOCTYPE html>"
+
+
+def test_head_has_headers_only(server):
+    response, body = get(server, "/song.ogg", method="HEAD")
+    assert response.status == 200 and body == b""
+    assert response.getheader("Content-Length") == str(len(BIG))
+
+
+@pytest.mark.parametrize("path, status", [
+    ("/missing.html", 404),
+    ("/../secret.txt", 404),
+    ("/%2e%2e/secret.txt", 404),
+    ("/a%00b", 400),
+    pytest.param("/" + "x" * 5000, 404, id="name-too-long"),
+])
+def test_bad_paths_get_an_error_response(server, path, status):
+    response, _ = get(server, path)
+    assert response.status == status
+
+
+def test_other_methods_are_refused(server):
+    response, _ = get(server, "/index.html", method="POST")
+    assert response.status == 405
+    assert response.getheader("Allow") == "GET, HEAD"
+
+
+def test_stats_count_requests(server):
+    get(server, "/song.ogg", Range="bytes=0-0")
+    stats = json.loads(get(server, serve.STATS_PATH)[1])
+    route = stats["routes"]["/song.ogg"]
+    assert route["requests"] >= 1 and "206" in route["status"]
@@ -0,0 +1,4 @@
+"""Build and maintenance tooling for the DoraChann portfolio site.
+
+Run the modules with ``python -m tools.<name>`` from the repository root.
+"""
@@ -0,0 +1,622 @@
+"""Static performance audit of the published pages, checked against budgets.
+
+Starting from the published pages, every page reachable through local
+links is parsed together with the stylesheets it loads. Every asset URL
+in the markup and in CSS ``url()``/``@import`` is resolved against the
+audited tree, and for each page the audit works out:
+
+* what a desktop visit downloads (the ``srcset``/``<source>`` candidate a
+  1920px wide, 1x viewport would pick; CSS backgrounds only when a rule
+  that uses them can match the page), with its gzip transfer size;
+* the critical request chain: render-blocking stylesheets, their
+  ``@import``s and fonts, and synchronous scripts in ``<head>``;
+* the likely LCP element: the largest image above the fold (the markup up
+  to the first ``</section>``, as in ``tools.bundle``).
+
+It flags references to missing files, byte-identical assets loaded under
+different names, eager images below the fold, images without intrinsic
+dimensions and synchronous third-party scripts. Assets that scripts load
+at runtime (the p5 sketches' images and sounds) are not visible to it.
+
+Results go to a JSON report in ``build/`` (never into the audited tree,
+which would publish it) and are compared with the per-page limits in
+``tools/budgets.json``; anything over budget fails the run with exit
+status 1. ``--update-budgets`` records the current weights (plus
+headroom) and issue counts, except for missing files and synchronous
+third-party scripts, which are never allowed.
+
+Usage::
+
+    python -m tools.build
+    python -m tools.audit [--root DIR] [--pages index.html ...]
+    python -m tools.audit --update-budgets
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import posixpath
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from . import bundle, css, markup, serve
+from .site import BUILD, DIST, PAGES, ROOT
+
+BUDGETS = ROOT / "tools" / "budgets.json"
+REPORT = BUILD / "audit-report.json"
+
+# The bench's desktop profile, at 1x.
+VIEWPORT = (1920, 1080)
+
+# Weight budgets written by --update-budgets sit this far above the
+# current value, so small content edits don't fail the audit.
+HEADROOM = 0.10
+WEIGHT_METRICS = ("transfer_kb", "image_kb", "script_kb", "style_kb", "font_kb", "critical_kb")
+COUNT_METRICS = ("requests", "critical_requests", "critical_depth")
+
+# Issues whose budget is always zero.
+STRICT_ISSUES = ("missing", "sync-third-party")
+
+KINDS = {
+    "image": {".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg", ".ico"},
+    "font": {".woff", ".woff2", ".ttf", ".otf"},
+    "script": {".js"},
+    "style": {".css"},
+    "media": {".mp3", ".ogg", ".wav", ".mp4", ".webm"},
+    "document": {".html"},
+}
+
+_TAG_RE = re.compile(r"<(/?)([a-zA-Z][\w-]*)\b([^>]*)>")
+_STYLE_RE = re.compile(r"<style\b[^>]*>(.*?)</style\s*>", re.IGNORECASE | re.DOTALL)
+_NOSCRIPT_RE = re.compile(r"<noscript\b[^>]*>.*?</noscript\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_SCRIPT_BODY_RE = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_WIDTH_QUERY_RE = re.compile(r"\(\s*(min|max)-width\s*:\s*([\d.]+)px\s*\)")
+
+
+def kind_of(url: str) -> str:
+    suffix = posixpath.splitext(url.split("?", 1)[0].split("#", 1)[0])[1].lower()
+    for kind, suffixes in KINDS.items():
+        if suffix in suffixes:
+            return kind
+    return "other"
+
+
+def kb(size: int) -> float:
+    return round(size / 1024, 1)
+
+
+def media_matches(query: Optional[str]) -> bool:
+    """Evaluate ``(min|max)-width`` conditions at :data:`VIEWPORT`; anything else matches."""
+    if not query:
+        return True
+    query = query.strip().lower()
+    if query in ("print", "not all"):
+        return False
+    for bound, value in _WIDTH_QUERY_RE.findall(query):
+        width = float(value)
+        if (bound == "min" and VIEWPORT[0] < width) or (bound == "max" and VIEWPORT[0] > width):
+            return False
+    return True
+
+
+def rendered_width(sizes: Optional[str]) -> float:
+    """Slot width from a ``sizes`` attribute, full viewport when unknown."""
+    for entry in (sizes or "").split(","):
+        entry = entry.strip()
+        condition = entry[:entry.rindex(")") + 1] if entry.startswith("(") else ""
+        if not media_matches(condition):
+            continue
+        value = entry[len(condition):].strip()
+        match = re.fullmatch(r"([\d.]+)(px|vw|vh)", value)
+        if match:
+            number, unit = float(match.group(1)), match.group(2)
+            if unit == "px":
+                return number
+            return VIEWPORT[0 if unit == "vw" else 1] * number / 100
+        return VIEWPORT[0]
+    return VIEWPORT[0]
+
+
+def srcset_urls(srcset: str) -> List[str]:
+    return [candidate.split()[0] for candidate in srcset.split(",") if candidate.split()]
+
+
+def pick_candidate(src: Optional[str], srcset: Optional[str], sizes: Optional[str]) -> Optional[str]:
+    """The URL a browser at :data:`VIEWPORT` would fetch for these attributes."""
+    candidates: List[Tuple[float, str]] = []
+    for candidate in (srcset or "").split(","):
+        parts = candidate.split()
+        if not parts:
+            continue
+        descriptor = parts[1] if len(parts) > 1 else "1x"
+        if descriptor.endswith("w"):
+            candidates.append((float(descriptor[:-1]), parts[0]))
+        elif descriptor == "1x":
+            return parts[0]
+    if not candidates:
+        return src
+    needed = rendered_width(sizes)
+    wide_enough = [c for c in candidates if c[0] >= needed]
+    return min(wide_enough)[1] if wide_enough else max(candidates)[1]
+
+
+def _css_urls(nodes: List[css.Node]) -> List[str]:
+    urls: List[str] = []
+    for node in nodes:
+        if isinstance(node, css.Rule):
+            text = node.declarations
+        elif node.children is not None:
+            urls += _css_urls(node.children)
+            continue
+        else:
+            text = node.body or ""
+        urls += [match.group(2) for match in _URL_RE.finditer(text)]
+    return urls
+
+
+def _font_urls(nodes: List[css.Node]) -> List[str]:
+    urls: List[str] = []
+    for node in nodes:
+        if isinstance(node, css.AtRule):
+            if node.name == "font-face" and node.body:
+                urls += [match.group(2) for match in _URL_RE.finditer(node.body)]
+            elif node.children is not None:
+                urls += _font_urls(node.children)
+    return urls
+
+
+class Site:
+    """Files under the audited root, with cached transfer sizes and digests."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._transfer: Dict[str, int] = {}
+        self._digests: Dict[str, str] = {}
+
+    def exists(self, path: str) -> bool:
+        return (self.root / path).is_file()
+
+    def text(self, path: str) -> str:
+        return (self.root / path).read_text(encoding="utf-8")
+
+    def transfer_size(self, path: str) -> int:
+        """Bytes on the wire: the gzip size for text files, as ``tools.serve`` sends them."""
+        if path not in self._transfer:
+            source = self.root / path
+            size = source.stat().st_size
+            if source.suffix.lower() in serve.COMPRESSIBLE:
+                packed = source.with_name(source.name + ".gz")
+                if packed.is_file():
+                    size = min(size, packed.stat().st_size)
+                else:
+                    size = min(size, len(gzip.compress(source.read_bytes(), compresslevel=9, mtime=0)))
+            self._transfer[path] = size
+        return self._transfer[path]
+
+    def digest(self, path: str) -> str:
+        if path not in self._digests:
+            self._digests[path] = hashlib.sha256((self.root / path).read_bytes()).hexdigest()
+        return self._digests[path]
+
+    def dimensions(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            with Image.open(self.root / path) as image:
+                return image.size
+        except (OSError, ValueError):
+            return None
+
+
+class PageAudit:
+    """Everything one page references and loads."""
+
+    def __init__(self, site: Site, page: str):
+        self.site = site
+        self.page = page
+        # Fallbacks in <noscript> duplicate what the page already loads
+        self.html = _NOSCRIPT_RE.sub("", _COMMENT_RE.sub("", site.text(page)))
+        self.loads: Dict[str, dict] = {}
+        self.missing: Dict[str, dict] = {}
+        self.issues: List[dict] = []
+        self.images: List[dict] = []
+        self.links: List[str] = []
+        self.chain = {"url": page, "kind": "document", "bytes": site.transfer_size(page), "children": []}
+        self._sheets: List[Tuple[str, str, Optional[dict]]] = []
+
+    def issue(self, kind: str, url: str, detail: str, size: Optional[int] = None) -> None:
+        entry = {"kind": kind, "url": url, "detail": detail}
+        if size is not None:
+            entry["bytes"] = size
+        self.issues.append(entry)
+
+    def reference(self, url: Optional[str], base: str) -> Optional[str]:
+        """Resolve a local ``url`` written in ``base``, noting it if the file is missing."""
+        if not url or not markup.is_local(url) or url.startswith("data:"):
+            return None
+        path = markup.resolve(base, url)
+        if not self.site.exists(path):
+            entry = self.missing.setdefault(path, {"url": url, "referrer": base, "count": 0})
+            entry["count"] += 1
+            return None
+        return path
+
+    def load(self, url: Optional[str], base: str, kind: Optional[str] = None) -> Optional[dict]:
+        """Record a download; third-party URLs count as requests of unknown size."""
+        if not url or url.startswith("data:"):
+            return None
+        if markup.is_local(url):
+            path = markup.resolve(base, url)
+            if not self.site.exists(path):
+                return None
+            key, size = path, self.site.transfer_size(path)
+        else:
+            key, size = url, None
+        if key not in self.loads:
+            self.loads[key] = {"url": key, "kind": kind or kind_of(key), "bytes": size,
+                               "third_party": size is None}
+        return self.loads[key]
+
+    # --- markup ------------------------------------------------------------
+
+    def scan(self) -> None:
+        body = re.search(r"<body\b", self.html, re.IGNORECASE)
+        head_end = body.start() if body else 0
+        _, fold_end = bundle.fold_span(self.html)
+        sources: Optional[List[Tuple[str, str]]] = None
+
+        for match in _TAG_RE.finditer(self.html):
+            closing, name = match.group(1), match.group(2).lower()
+            attrs = markup.parse_attrs(match.group(3))
+            get = lambda key: markup.get_attr(attrs, key)  # noqa: E731
+            in_head = match.start() < head_end
+
+            style = get("style")
+            if style and not closing:
+                for url in (m.group(2) for m in _URL_RE.finditer(style)):
+                    self.reference(url, self.page)
+                    self.load(url, self.page)
+
+            if name == "picture":
+                sources = None if closing else []
+            elif closing:
+                continue
+            elif name == "link":
+                self._link(attrs, in_head)
+            elif name == "script" and get("src"):
+                self._script(attrs, in_head)
+            elif name == "source":
+                srcset = get("srcset")
+                for url in srcset_urls(srcset or "") + [get("src")]:
+                    self.reference(url, self.page)
+                if sources is not None and srcset and media_matches(get("media")):
+                    sources.append((srcset, get("sizes")))
+                elif get("src"):
+                    self.load(get("src"), self.page, "media")
+            elif name == "img":
+                self._img(attrs, sources, offscreen=match.start() > fold_end)
+                sources = None if sources is None else []
+            elif name in ("audio", "video"):
+                self.reference(get("poster"), self.page)
+                self.load(get("poster"), self.page, "image")
+                self.reference(get("src"), self.page)
+                if get("autoplay") is not None or get("preload") == "auto":
+                    self.load(get("src"), self.page, "media")
+            elif name == "a" and get("href"):
+                path = self.reference(get("href"), self.page)
+                if path and path.endswith(".html"):
+                    self.links.append(path)
+
+        for text in _STYLE_RE.findall(self.html):
+            self._sheets.append((self.page, text, None))
+
+    def _link(self, attrs: markup.Attrs, in_head: bool) -> None:
+        rel = (markup.get_attr(attrs, "rel") or "").lower().split()
+        href = markup.get_attr(attrs, "href")
+        path = self.reference(href, self.page)
+        if "alternate" in rel:
+            if path and path.endswith(".html"):
+                self.links.append(path)
+        elif "stylesheet" in rel:
+            resource = self.load(href, self.page, "style")
+            blocking = in_head and media_matches(markup.get_attr(attrs, "media"))
+            self._stylesheet(href, path, resource, self.chain if blocking else None)
+        elif "preload" in rel:
+            kind = markup.get_attr(attrs, "as")
+            for url in srcset_urls(markup.get_attr(attrs, "imagesrcset") or ""):
+                self.reference(url, self.page)
+            if kind == "style":
+                self._stylesheet(href, path, self.load(href, self.page, "style"), None)
+            elif kind == "image":
+                url = pick_candidate(href, markup.get_attr(attrs, "imagesrcset"),
+                                     markup.get_attr(attrs, "imagesizes"))
+                self.load(url, self.page, "image")
+            else:
+                self.load(href, self.page, {"script": "script", "font": "font"}.get(kind))
+        elif "icon" in rel:
+            self.load(href, self.page, "image")
+
+    def _stylesheet(self, url: Optional[str], path: Optional[str], resource: Optional[dict],
+                    parent: Optional[dict]) -> None:
+        node = None
+        if parent is not None and resource is not None:
+            node = {"url": resource["url"], "kind": "style", "bytes": resource["bytes"], "children": []}
+            parent["children"].append(node)
+        if path:
+            self._sheets.append((path, self.site.text(path), node))
+
+    def _script(self, attrs: markup.Attrs, in_head: bool) -> None:
+        src = markup.get_attr(attrs, "src")
+        self.reference(src, self.page)
+        resource = self.load(src, self.page, "script")
+        deferred = any(key in ("async", "defer") for key, _ in attrs) or \
+            (markup.get_attr(attrs, "type") or "").lower() == "module"
+        if deferred:
+            return
+        if not markup.is_local(src):
+            self.issue("sync-third-party", src, "blocks parsing; add defer or async")
+        if in_head and resource is not None:
+            self.chain["children"].append(
+                {"url": resource["url"], "kind": "script", "bytes": resource["bytes"], "children": []})
+
+    def _img(self, attrs: markup.Attrs, sources: Optional[List[Tuple[str, str]]], offscreen: bool) -> None:
+        src = markup.get_attr(attrs, "src")
+        srcset = markup.get_attr(attrs, "srcset")
+        for url in [src] + srcset_urls(srcset or ""):
+            self.reference(url, self.page)
+        if sources:
+            url = pick_candidate(None, *sources[0])
+        else:
+            url = pick_candidate(src, srcset, markup.get_attr(attrs, "sizes"))
+        resource = self.load(url, self.page, "image")
+        # Report what the browser downloads (the chosen <source>/srcset
+        # candidate), not the fallback in src
+        fetched = resource["url"] if resource else url or src or ""
+        size = resource["bytes"] if resource else None
+
+        lazy = (markup.get_attr(attrs, "loading") or "").lower() == "lazy"
+        width, height = markup.get_attr(attrs, "width"), markup.get_attr(attrs, "height")
+        if width is None or height is None:
+            self.issue("no-dimensions", fetched, "no width/height; the layout shifts when it loads")
+        if offscreen and not lazy:
+            detail = "below the fold without loading=\"lazy\""
+            if size is not None:
+                detail += "; %.1f kB fetched up front" % kb(size)
+            self.issue("eager-offscreen", fetched, detail, size)
+
+        # Estimated on-screen size: the sizes slot, or the intrinsic width,
+        # never wider than the viewport, at the image's aspect ratio.
+        intrinsic = None
+        if width and height and width.isdigit() and height.isdigit():
+            intrinsic = (int(width), int(height))
+        elif resource is not None and not resource["third_party"]:
+            intrinsic = self.site.dimensions(resource["url"])
+        shown = None
+        if intrinsic and intrinsic[0]:
+            sizes = markup.get_attr(attrs, "sizes")
+            shown_width = min(rendered_width(sizes) if sizes else intrinsic[0], VIEWPORT[0])
+            shown = (round(shown_width), round(shown_width * intrinsic[1] / intrinsic[0]))
+        self.images.append({"url": resource["url"] if resource else src, "width": shown[0] if shown else None,
+                            "height": shown[1] if shown else None, "offscreen": offscreen, "lazy": lazy,
+                            "fetchpriority": markup.get_attr(attrs, "fetchpriority")})
+
+    # --- stylesheets ---------------------------------------------------------
+
+    def scan_styles(self) -> None:
+        scripts = [body for attrs, body in _SCRIPT_BODY_RE.findall(self.html) if body.strip()]
+        scripts += [self.site.text(r["url"]) for r in self.loads.values()
+                    if r["kind"] == "script" and not r["third_party"]]
+        usage = bundle.page_usage(self.html, scripts)
+        done = set()
+        while self._sheets:
+            sheet, text, node = self._sheets.pop(0)
+            nodes = css.parse(text)
+            for url in _css_urls(nodes):
+                self.reference(url, sheet)
+            for url in css.imports(nodes):
+                path = self.reference(url, sheet)
+                resource = self.load(url, sheet, "style")
+                child = None
+                if node is not None and resource is not None:
+                    child = {"url": resource["url"], "kind": "style", "bytes": resource["bytes"], "children": []}
+                    node["children"].append(child)
+                if path and path not in done:
+                    done.add(path)
+                    self._sheets.append((path, self.site.text(path), child))
+            for url in _css_urls(css.prune(nodes, usage)):
+                self.load(url, sheet)
+            if node is not None:
+                for url in _font_urls(nodes):
+                    resource = self.load(url, sheet, "font")
+                    if resource is not None:
+                        node["children"].append({"url": resource["url"], "kind": "font",
+                                                 "bytes": resource["bytes"], "children": []})
+
+    # --- results -------------------------------------------------------------
+
+    def duplicates(self) -> None:
+        seen: Dict[str, str] = {}
+        for key, resource in sorted(self.loads.items()):
+            if resource["third_party"]:
+                continue
+            digest = self.site.digest(key)
+            if digest in seen:
+                self.issue("duplicate", key, "same bytes as %s; %.1f kB wasted" % (seen[digest], kb(resource["bytes"])),
+                           resource["bytes"])
+            else:
+                seen[digest] = key
+
+    def lcp(self) -> Optional[dict]:
+        candidates = [image for image in self.images if not image["offscreen"] and image["width"]]
+        if not candidates:
+            return None
+        best = max(candidates, key=lambda image: image["width"] * image["height"])
+        if best["lazy"]:
+            self.issue("lcp-lazy", best["url"], "the likely LCP image is lazy-loaded")
+        return best
+
+    def run(self) -> dict:
+        self.scan()
+        self.scan_styles()
+        for path, entry in sorted(self.missing.items()):
+            self.issue("missing", path, "referenced %d time%s from %s" % (
+                entry["count"], "" if entry["count"] == 1 else "s", entry["referrer"]))
+        self.duplicates()
+        lcp = self.lcp()
+
+        known = [r for r in self.loads.values() if not r["third_party"]]
+        metrics = {
+            "transfer_kb": kb(self.chain["bytes"] + sum(r["bytes"] for r in known)),
+            "requests": 1 + len(self.loads),
+            "third_party_requests": len(self.loads) - len(known),
+        }
+        for kind in ("image", "script", "style", "font", "media"):
+            metrics[kind + "_kb"] = kb(sum(r["bytes"] for r in known if r["kind"] == kind))
+
+        critical = _flatten(self.chain)[1:]
+        metrics["critical_requests"] = len(critical)
+        metrics["critical_kb"] = kb(self.chain["bytes"] + sum(n["bytes"] or 0 for n in critical))
+        metrics["critical_depth"] = _depth(self.chain)
+
+        counts: Dict[str, int] = {}
+        for issue in self.issues:
+            counts[issue["kind"]] = counts.get(issue["kind"], 0) + 1
+        return {
+            "metrics": metrics,
+            "issue_counts": counts,
+            "issues": self.issues,
+            "critical_chain": self.chain,
+            "lcp": lcp,
+            "resources": sorted(self.loads.values(), key=lambda r: (r["kind"], r["url"])),
+        }
+
+
+def _flatten(node: dict) -> List[dict]:
+    out = [node]
+    for child in node["children"]:
+        out += _flatten(child)
+    return out
+
+
+def _depth(node: dict) -> int:
+    return 1 + max((_depth(child) for child in node["children"]), default=0)
+
+
+def crawl(site: Site, seeds: List[str], follow: bool = True) -> Dict[str, dict]:
+    """Audit ``seeds`` and, with ``follow``, every local page they link to."""
+    results: Dict[str, dict] = {}
+    queue = [page for page in seeds if site.exists(page)]
+    while queue:
+        page = queue.pop(0)
+        if page in results:
+            continue
+        audit = PageAudit(site, page)
+        results[page] = audit.run()
+        if follow:
+            queue += [link for link in audit.links if link not in results]
+    return results
+
+
+# --- Budgets -----------------------------------------------------------------
+
+def page_budget(budgets: dict, page: str) -> dict:
+    budget = dict(budgets.get("default", {}))
+    override = budgets.get("pages", {}).get(page, {})
+    issues = dict(budget.get("issues", {}))
+    issues.update(override.get("issues", {}))
+    budget.update(override)
+    budget["issues"] = issues
+    return budget
+
+
+def check(results: Dict[str, dict], budgets: dict) -> List[dict]:
+    violations = []
+    for page, result in results.items():
+        budget = page_budget(budgets, page)
+        limits = [(metric, limit, result["metrics"].get(metric)) for metric, limit in budget.items()
+                  if metric != "issues"]
+        limits += [("issues." + kind, limit, result["issue_counts"].get(kind, 0))
+                   for kind, limit in budget["issues"].items()]
+        for metric, limit, current in limits:
+            if current is not None and current > limit:
+                violations.append({"page": page, "metric": metric, "budget": limit, "current": current})
+    return violations
+
+
+def updated_budgets(results: Dict[str, dict], budgets: dict) -> dict:
+    default = dict(budgets.get("default", {}))
+    default["issues"] = dict(default.get("issues", {}), **{kind: 0 for kind in STRICT_ISSUES})
+    pages = dict(budgets.get("pages", {}))
+    for page, result in results.items():
+        metrics = result["metrics"]
+        budget = {metric: math.ceil(metrics[metric] * (1 + HEADROOM)) for metric in WEIGHT_METRICS}
+        budget.update({metric: metrics[metric] for metric in COUNT_METRICS})
+        budget["issues"] = {kind: count for kind, count in result["issue_counts"].items()
+                            if kind not in STRICT_ISSUES}
+        pages[page] = budget
+    return {"default": default, "pages": pages}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Audit page weight, request chains and asset references.")
+    parser.add_argument("--root", type=Path, default=DIST, help="tree to audit (default: dist/)")
+    parser.add_argument("--pages", nargs="+", metavar="PAGE",
+                        help="audit only these pages (default: the published pages and every page they link to)")
+    parser.add_argument("--budgets", type=Path, default=BUDGETS)
+    parser.add_argument("--report", type=Path, default=REPORT, help="JSON report (default: build/audit-report.json)")
+    parser.add_argument("--update-budgets", action="store_true", help="store this run as the new budgets")
+    args = parser.parse_args(argv)
+
+    if not (args.root / "index.html").exists():
+        sys.exit("%s has no index.html; run python -m tools.build first" % args.root)
+
+    if args.root.resolve() in args.report.resolve().parents:
+        sys.exit("%s is inside the audited tree %s and would be published; write it elsewhere"
+                 % (args.report, args.root))
+
+    site = Site(args.root.resolve())
+    results = crawl(site, args.pages or list(PAGES), follow=not args.pages)
+    for page, result in results.items():
+        metrics = result["metrics"]
+        lcp = result["lcp"]
+        print("%-32s %7.1f kB %3d req  critical %d req/%.1f kB depth %d  LCP %s" % (
+            page, metrics["transfer_kb"], metrics["requests"], metrics["critical_requests"],
+            metrics["critical_kb"], metrics["critical_depth"], lcp["url"] if lcp else "-"))
+        for issue in result["issues"]:
+            print("  %-18s %s: %s" % (issue["kind"], issue["url"], issue["detail"]))
+
+    budgets = {}
+    if args.budgets.exists():
+        budgets = json.loads(args.budgets.read_text())
+    violations = check(results, budgets)
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps({
+        "root": str(args.root),
+        "viewport": list(VIEWPORT),
+        "results": results,
+        "violations": violations,
+    }, indent=2) + "\n")
+    print("report: %s" % args.report)
+
+    if args.update_budgets:
+        args.budgets.write_text(json.dumps(updated_budgets(results, budgets), indent=2, sort_keys=True) + "\n")
+        print("budgets updated: %s" % args.budgets)
+        violations = check(results, json.loads(args.budgets.read_text()))
+
+    for v in violations:
+        print("OVER BUDGET %(page)s %(metric)s: %(current)s > %(budget)s" % v)
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""Headless frame-time and page-load benchmarks.
+
+Every published page is opened in headless Chromium at desktop, tablet and
+mobile sizes, served from ``dist/`` by ``tools.serve`` (the same server
+and cache headers as production). After load the
+page is scrolled top to bottom while the pointer sweeps the viewport, and
+the following are collected through the Performance API and the DevTools
+protocol:
+
+* rAF frame intervals (what the user sees as smoothness),
+* time spent in each p5 sketch's ``draw()``, keyed by the canvas parent id,
+* long tasks, layout counts and JS heap size,
+* navigation timings, first paint and LCP.
+
+Every measurement starts from an empty HTTP cache, so each page and
+viewport pays for a cold load. Results are written to a JSON report in
+``build/`` (outside the published tree) and compared against the baseline in
+``tools/bench-baseline.json``; any metric that gets worse by more than the
+threshold fails the run with exit status 1. So does a page or viewport
+the baseline has no numbers for: record them with ``--update-baseline``
+on the reference machine and check the file in.
+
+Usage::
+
+    python -m tools.build && python -m tools.vendor
+    python -m tools.bench [--pages index.html ...] [--viewports mobile ...]
+    python -m tools.bench --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.actions.action_builder import ActionBuilder
+
+from . import serve, vendor
+from .site import BUILD, DIST, PAGES, ROOT
+
+BASELINE = ROOT / "tools" / "bench-baseline.json"
+REPORT = BUILD / "bench-report.json"
+THRESHOLD = 0.15
+
+# name -> (width, height, device pixel ratio, mobile, CPU slowdown)
+VIEWPORTS = {
+    "desktop": (1920, 1080, 1, False, 1),
+    "tablet": (820, 1180, 2, True, 2),
+    "mobile": (390, 844, 3, True, 4),
+}
+
+SCROLL_STEPS = 24
+STEP_SECONDS = 0.25
+SETTLE_SECONDS = 1.0
+
+# Metrics checked against the baseline (lower is better), with an absolute
+# allowance so that sub-millisecond noise never fails a run.
+REGRESSION_SLACK = {
+    "frames.p95": 2.0,
+    "sketches.p95": 1.0,
+    "long_tasks.total": 50.0,
+    "load.lcp": 100.0,
+    "heap_mb": 2.0,
+}
+
+INSTRUMENT_JS = r"""
+(() => {
+  const perf = window.__perf = { frames: [], longTasks: [], lcp: null, sketches: {}, since: 0 };
+
+  let last = 0;
+  const tick = (now) => {
+    if (last) perf.frames.push(now - last);
+    last = now;
+    requestAnimationFrame(tick);
+  };
+  requestAnimationFrame(tick);
+
+  new PerformanceObserver((list) => {
+    for (const e of list.getEntries()) perf.longTasks.push([e.startTime, e.duration]);
+  }).observe({ type: 'longtask', buffered: true });
+
+  new PerformanceObserver((list) => {
+    const e = list.getEntries().at(-1);
+    perf.lcp = {
+      time: e.startTime,
+      size: e.size,
+      url: e.url || null,
+      element: e.element ? e.element.tagName.toLowerCase() + (e.element.className ? '.' + e.element.className : '') : null
+    };
+  }).observe({ type: 'largest-contentful-paint', buffered: true });
+
+  // Time every p5 redraw, keyed by where the sketch's canvas lives.
+  let P5;
+  Object.defineProperty(window, 'p5', {
+    configurable: true,
+    get() { return P5; },
+    set(value) {
+      P5 = value;
+      const redraw = value.prototype.redraw;
+      value.prototype.redraw = function (...args) {
+        const start = performance.now();
+        const result = redraw.apply(this, args);
+        const parent = this.canvas && this.canvas.parentElement;
+        const key = this._isGlobal ? 'global' : (parent && parent.id) || (parent === document.body ? 'body' : 'sketch');
+        (perf.sketches[key] = perf.sketches[key] || []).push(performance.now() - start);
+        return result;
+      };
+    }
+  });
+})();
+"""
+
+COLLECT_JS = r"""
+const perf = window.__perf;
+const nav = performance.getEntriesByType('navigation')[0];
+const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+return {
+  frames: perf.frames,
+  sketches: perf.sketches,
+  longTasks: perf.longTasks.filter(([start]) => start >= perf.since),
+  loadLongTasks: perf.longTasks.filter(([start]) => start < perf.since),
+  lcp: perf.lcp,
+  fcp: fcp ? fcp.startTime : null,
+  nav: nav ? {
+    ttfb: nav.responseStart,
+    dcl: nav.domContentLoadedEventEnd,
+    load: nav.loadEventEnd,
+    transfer: nav.transferSize
+  } : null,
+  resources: performance.getEntriesByType('resource').length
+};
+"""
+
+
+def make_driver(args: argparse.Namespace) -> webdriver.Chrome:
+    options = webdriver.ChromeOptions()
+    for flag in ("--headless=new", "--enable-precise-memory-info", "--autoplay-policy=no-user-gesture-required",
+                 "--disable-background-timer-throttling", "--hide-scrollbars"):
+        options.add_argument(flag)
+    if args.no_sandbox:
+        options.add_argument("--no-sandbox")
+    if args.chrome:
+        options.binary_location = args.chrome
+    service = Service(executable_path=args.driver) if args.driver else Service()
+    driver = webdriver.Chrome(options=options, service=service)
+    driver.execute_cdp_cmd("Performance.enable", {})
+    driver.execute_cdp_cmd("Network.enable", {})
+    # Fonts and anything else off-site would make timings depend on the network.
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": ["https://*"]})
+    # Every measurement is a first visit; see measure().
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INSTRUMENT_JS})
+    return driver
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(values: List[float]) -> dict:
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "max": max(values, default=0.0),
+    }
+
+
+def emulate(driver: webdriver.Chrome, viewport: str) -> None:
+    width, height, dpr, mobile, slowdown = VIEWPORTS[viewport]
+    driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+        "width": width, "height": height, "deviceScaleFactor": dpr, "mobile": mobile,
+    })
+    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": mobile})
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": slowdown})
+
+
+def interact(driver: webdriver.Chrome, viewport: str) -> None:
+    """Scroll the page top to bottom, moving the pointer on desktop sizes."""
+    width, height, _, mobile, _ = VIEWPORTS[viewport]
+    scroll_height = driver.execute_script("return document.documentElement.scrollHeight - innerHeight")
+    for step in range(SCROLL_STEPS + 1):
+        driver.execute_script("window.scrollTo(0, arguments[0])", scroll_height * step / SCROLL_STEPS)
+        if not mobile:
+            actions = ActionBuilder(driver, duration=int(STEP_SECONDS * 1000))
+            x = width // 2 + int(width * 0.3 * (1 if step % 2 else -1))
+            y = height // 2 + int(height * 0.3 * (1 if step % 4 < 2 else -1))
+            actions.pointer_action.move_to_location(x, y)
+            actions.perform()
+        else:
+            time.sleep(STEP_SECONDS)
+
+
+def measure(driver: webdriver.Chrome, base_url: str, page: str, viewport: str) -> dict:
+    emulate(driver, viewport)
+    driver.get("about:blank")
+    # One driver serves every page and viewport; without this only the first
+    # load would be cold and the rest would time the cache.
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    driver.get(base_url + page)
+    while driver.execute_script("return document.readyState") != "complete":
+        time.sleep(0.05)
+    time.sleep(SETTLE_SECONDS)
+
+    driver.execute_script("__perf.frames = []; __perf.sketches = {}; __perf.since = performance.now();")
+    started = time.monotonic()
+    interact(driver, viewport)
+    elapsed = time.monotonic() - started
+
+    data = driver.execute_script(COLLECT_JS)
+    metrics = {m["name"]: m["value"] for m in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+    draws = [d for samples in data["sketches"].values() for d in samples]
+    return {
+        "frames": dict(summarize(data["frames"]), fps=len(data["frames"]) / elapsed if elapsed else 0.0,
+                       janky=sum(1 for f in data["frames"] if f > 50)),
+        "sketches": dict(summarize(draws), by_canvas={k: summarize(v) for k, v in data["sketches"].items()}),
+        "long_tasks": {
+            "count": len(data["longTasks"]),
+            "total": sum(d for _, d in data["longTasks"]),
+            "during_load": sum(d for _, d in data["loadLongTasks"]),
+        },
+        "load": {
+            "ttfb": data["nav"]["ttfb"] if data["nav"] else None,
+            "fcp": data["fcp"],
+            "dcl": data["nav"]["dcl"] if data["nav"] else None,
+            "load": data["nav"]["load"] if data["nav"] else None,
+            "lcp": data["lcp"]["time"] if data["lcp"] else None,
+            "lcp_element": data["lcp"],
+            "resources": data["resources"],
+        },
+        "heap_mb": metrics.get("JSHeapUsedSize", 0) / 2 ** 20,
+        "layouts": metrics.get("LayoutCount"),
+        "layout_ms": metrics.get("LayoutDuration", 0) * 1000,
+        "script_ms": metrics.get("ScriptDuration", 0) * 1000,
+    }
+
+
+def lookup(result: dict, dotted: str) -> Optional[float]:
+    value = result
+    for key in dotted.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, (int, float)) else None
+
+
+def unmeasured(results: Dict[str, dict], baseline: Dict[str, dict]) -> List[str]:
+    """``page [viewport]`` pairs of this run that the baseline has no numbers for."""
+    return ["%s [%s]" % (page, viewport) for page, viewports in results.items()
+            for viewport in viewports if not baseline.get(page, {}).get(viewport)]
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[dict]:
+    regressions = []
+    for page, viewports in results.items():
+        for viewport, result in viewports.items():
+            base = baseline.get(page, {}).get(viewport)
+            if not base:
+                continue
+            for metric, slack in REGRESSION_SLACK.items():
+                now, before = lookup(result, metric), lookup(base, metric)
+                if now is None or before is None:
+                    continue
+                if now > before * (1 + threshold) + slack:
+                    regressions.append({
+                        "page": page, "viewport": viewport, "metric": metric,
+                        "baseline": before, "current": now,
+                    })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark frame times and page loads in headless Chromium.")
+    parser.add_argument("--root", type=Path, default=DIST, help="tree to serve (default: dist/)")
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), metavar="PAGE")
+    parser.add_argument("--viewports", nargs="+", default=list(VIEWPORTS), choices=list(VIEWPORTS))
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--report", type=Path, default=REPORT)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="allowed relative slowdown before failing (default: %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--chrome", default=os.environ.get("CHROME_BIN"), help="Chromium binary")
+    parser.add_argument("--driver", default=os.environ.get("CHROMEDRIVER"), help="chromedriver binary")
+    parser.add_argument("--no-sandbox", action="store_true", help="pass --no-sandbox (needed as root in containers)")
+    args = parser.parse_args(argv)
+
+    if not (args.root / "index.html").exists():
+        sys.exit("%s has no index.html; run python -m tools.build first" % args.root)
+    if vendor.missing():
+        sys.exit("p5 is not vendored yet; run python -m tools.vendor and rebuild")
+    if not args.update_baseline and not args.baseline.exists():
+        sys.exit("no baseline at %s; record one with --update-baseline" % args.baseline)
+
+    server = serve.ServerThread(args.root)
+    base_url = "http://127.0.0.1:%d/" % server.port
+    driver = make_driver(args)
+    results: Dict[str, dict] = {}
+    try:
+        for page in args.pages:
+            for viewport in args.viewports:
+                result = measure(driver, base_url, page, viewport)
+                results.setdefault(page, {})[viewport] = result
+                print("%-32s %-8s %5.1f fps  frame p95 %6.1f ms  draw p95 %5.1f ms  LCP %s" % (
+                    page, viewport, result["frames"]["fps"], result["frames"]["p95"],
+                    result["sketches"]["p95"], "%.0f ms" % result["load"]["lcp"] if result["load"]["lcp"] else "-"))
+        server_stats = server.stats()
+    finally:
+        driver.quit()
+        server.stop()
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text()).get("results", {})
+    regressions = compare(results, baseline, args.threshold)
+    missing = unmeasured(results, baseline)
+
+    report = {
+        "generated": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "threshold": args.threshold,
+        "results": results,
+        "regressions": regressions,
+        "unmeasured": missing,
+        "server": server_stats,
+    }
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=2) + "\n")
+    print("report: %s" % args.report)
+
+    if args.update_baseline:
+        merged = dict(baseline)
+        for page, viewports in results.items():
+            merged.setdefault(page, {}).update(viewports)
+        args.baseline.write_text(json.dumps({"results": merged}, indent=2, sort_keys=True) + "\n")
+        print("baseline updated: %s" % args.baseline)
+        return
+
+    for r in regressions:
+        print("REGRESSION %(page)s [%(viewport)s] %(metric)s: %(baseline).1f -> %(current).1f" % r)
+    for name in missing:
+        print("NO BASELINE %s (run with --update-baseline)" % name)
+    if regressions or missing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
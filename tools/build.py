@@ -0,0 +1,122 @@
+"""Build the deployable site into ``dist/``.
+
+The static directories are mirrored as-is, responsive image variants are
+generated, and each page is written (once per language for bilingual
+pages) with its image tags rewritten, its CDN scripts pointed at the
+vendored copies, and its styles and scripts bundled with every asset URL
+fingerprinted. Text files get a gzip sibling for ``tools.serve``. Files
+that have not changed since the last build are left alone.
+
+Usage::
+
+    python -m tools.build [--dist DIR] [--clean]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+from . import bundle, i18n, images, serve, vendor
+from .site import DIST, PAGES, ROOT, STATIC_DIRS, is_static
+
+
+def copy_if_changed(src: Path, dst: Path) -> bool:
+    try:
+        target = dst.stat()
+    except FileNotFoundError:
+        pass
+    else:
+        source = src.stat()
+        if target.st_size == source.st_size and target.st_mtime_ns == source.st_mtime_ns:
+            return False
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dst)
+    return True
+
+
+def mirror_static(root: Path, dist: Path) -> int:
+    copied = 0
+    for directory in STATIC_DIRS:
+        for src in sorted((root / directory).rglob("*")):
+            rel = src.relative_to(root)
+            if src.is_file() and is_static(rel.as_posix()):
+                copied += copy_if_changed(src, dist / rel)
+    return copied
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def precompress(dist: Path) -> int:
+    """Write ``.gz`` next to every compressible file that shrinks, drop orphans."""
+    written = 0
+    for path in sorted(dist.rglob("*")):
+        if not path.is_file():
+            continue
+        if path.suffix == ".gz":
+            if not path.with_suffix("").exists():
+                path.unlink()
+            continue
+        if path.suffix.lower() not in serve.COMPRESSIBLE:
+            continue
+        target = path.with_name(path.name + ".gz")
+        if target.exists() and target.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            continue
+        data = path.read_bytes()
+        packed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(packed) < len(data):
+            target.write_bytes(packed)
+            written += 1
+        elif target.exists():
+            target.unlink()
+    return written
+
+
+def build(root: Path = ROOT, dist: Path = DIST, clean: bool = False) -> None:
+    if clean and dist.exists():
+        shutil.rmtree(dist)
+    copied = mirror_static(root, dist)
+    print("static: %d files copied" % copied)
+
+    manifest = images.build_images(root, dist)
+
+    for url in vendor.missing(root):
+        print("warning: %s is not vendored, pages keep loading it from the CDN "
+              "(run python -m tools.vendor)" % url)
+    for path in vendor.mismatched(root):
+        print("warning: %s does not match its pinned checksum" % path)
+
+    bundler = bundle.Bundler(root, dist)
+    written = total = 0
+    for page in PAGES:
+        source = (root / page).read_text(encoding="utf-8")
+        for out_page, html in i18n.variants(source, page):
+            html = images.rewrite_page(html, out_page, manifest)
+            html = vendor.rewrite_page(html, out_page, root)
+            html = bundle.rewrite_page(html, out_page, bundler)
+            written += write_if_changed(dist / out_page, html)
+            total += 1
+    print("pages: %d of %d rewritten" % (written, total))
+    print("bundles: %d fingerprinted files, %d stale removed" % (len(bundler.written), bundler.prune()))
+    print("gzip: %d files precompressed" % precompress(dist))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build the deployable site.")
+    parser.add_argument("--dist", type=Path, default=DIST, help="output tree (default: dist/)")
+    parser.add_argument("--clean", action="store_true", help="delete the output tree first")
+    args = parser.parse_args(argv)
+    build(ROOT, args.dist, args.clean)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Per-page CSS/JS bundles, inlined critical CSS and fingerprinted URLs.
+
+For every page the build:
+
+* merges its stylesheets in link order, drops rules whose selectors can
+  never match the page (see ``css.Usage``), minifies the rest into one
+  ``css/bundle.<hash>.css`` and loads it without blocking render;
+* inlines the subset of those rules that applies above the fold (the
+  markup up to the end of the first ``<section>``) in a ``<style>`` tag;
+* turns ``@import``-ed web font stylesheets into non-blocking links;
+* concatenates and minifies its own scripts (and any inline script after
+  them) into one deferred ``js/bundle.<hash>.js``, each wrapped so that
+  an exception stops only its own file (see :func:`join_scripts`), and
+  defers p5 and p5.sound so nothing in ``<head>`` blocks parsing;
+* points every other local asset URL in the markup at a content-hashed
+  copy, so everything a page references can be cached as immutable.
+
+Usage::
+
+    python -m tools.build
+"""
+
+from __future__ import annotations
+
+import hashlib
+import posixpath
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from . import css, js, markup, vendor
+
+HASH_LENGTH = 10
+CSS_BUNDLE = "css/bundle"
+JS_BUNDLE = "js/bundle"
+
+# Fingerprinted names: bundles, asset copies and image variants alike.
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{%d}[.-]" % HASH_LENGTH)
+
+# Elements and names that p5 creates at runtime.
+P5_NAMES = {"canvas", "main", "p5Canvas", "defaultCanvas0"}
+
+# Attributes holding asset URLs, by tag.
+URL_ATTRS = {
+    "img": ("src", "srcset"),
+    "source": ("src", "srcset"),
+    "audio": ("src",),
+    "video": ("src", "poster"),
+    "script": ("src",),
+    "link": ("href", "imagesrcset"),
+}
+
+ASYNC_STYLESHEET = ('<link rel="preload" href="%s" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+                    '<noscript><link rel="stylesheet" href="%s"></noscript>')
+
+_FOLD_END_RE = re.compile(r"</section\s*>", re.IGNORECASE)
+_BODY_RE = re.compile(r"<body\b[^>]*>", re.IGNORECASE)
+_SCRIPT_RE = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+# A tag on its own line, so removing it doesn't leave a blank line behind.
+_OWN_LINE = r"[ \t]*%s[ \t]*\n?"
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def fingerprinted(path: str, data: bytes) -> str:
+    stem, ext = posixpath.splitext(path)
+    return "%s.%s%s" % (stem, digest(data), ext)
+
+
+class Bundler:
+    """Writes fingerprinted files into ``dist`` and remembers them for pruning."""
+
+    def __init__(self, root: Path, dist: Path):
+        self.root = root
+        self.dist = dist
+        self.written: Set[str] = set()
+        self.assets: Dict[str, str] = {}
+
+    def write(self, path: str, data: bytes) -> str:
+        """Write ``data`` under a fingerprinted version of ``path``."""
+        rel = fingerprinted(path, data)
+        target = self.dist / rel
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+        self.written.add(rel)
+        return rel
+
+    def asset(self, path: str) -> Optional[str]:
+        """Fingerprinted copy of a file already mirrored into ``dist``."""
+        if path not in self.assets:
+            source = self.dist / path
+            if not source.is_file():
+                return None
+            self.assets[path] = self.write(path, source.read_bytes())
+        return self.assets[path]
+
+    def prune(self) -> int:
+        """Delete fingerprinted copies and bundles a previous build left behind."""
+        removed = 0
+        for path in self.dist.rglob("*"):
+            rel = path.relative_to(self.dist).as_posix()
+            if (path.is_file() and not rel.startswith("assets/img/")
+                    and re.search(r"\.[0-9a-f]{%d}\.[^./]+$" % HASH_LENGTH, rel)
+                    and rel not in self.written):
+                path.unlink()
+                removed += 1
+        return removed
+
+
+def _remove(html: str, tag: str) -> str:
+    return re.sub(_OWN_LINE % re.escape(tag), "", html, count=1)
+
+
+def fold_span(html: str) -> Tuple[int, int]:
+    """Offsets of the above-the-fold markup: ``<body>`` to the first ``</section>``."""
+    body = _BODY_RE.search(html)
+    start = body.start() if body else 0
+    end = _FOLD_END_RE.search(html, start)
+    return start, end.end() if end else len(html)
+
+
+def _fold(html: str) -> str:
+    start, end = fold_span(html)
+    return html[start:end]
+
+
+def _local_scripts(html: str, page: str, root: Path) -> List[re.Match]:
+    """Script tags to bundle: local files, then inline scripts that follow them."""
+    found = []
+    for match in _SCRIPT_RE.finditer(html):
+        attrs = markup.parse_attrs(match.group(1))
+        src = markup.get_attr(attrs, "src")
+        kind = (markup.get_attr(attrs, "type") or "text/javascript").lower()
+        if kind not in ("text/javascript", "application/javascript"):
+            continue
+        if src is None:
+            if found:
+                found.append(match)
+        elif markup.is_local(src) and markup.resolve(page, src) not in vendor.VENDORED.values() \
+                and (root / markup.resolve(page, src)).is_file():
+            found.append(match)
+    return found
+
+
+def _script_source(match: re.Match, page: str, root: Path) -> str:
+    src = markup.get_attr(markup.parse_attrs(match.group(1)), "src")
+    if src is None:
+        return match.group(2)
+    return (root / markup.resolve(page, src)).read_text(encoding="utf-8")
+
+
+def page_usage(html: str, scripts: List[str]) -> css.Usage:
+    usage = css.Usage()
+    usage.add_html(html)
+    for source in scripts:
+        usage.add_script(source)
+    if any(url in html or path in html for url, path in vendor.VENDORED.items()):
+        usage.names |= P5_NAMES
+    return usage
+
+
+def bundle_styles(html: str, page: str, bundler: Bundler, scripts: List[str]) -> str:
+    links = []
+    for match in markup.find_tags(html, "link"):
+        attrs = markup.parse_attrs(match.group(3))
+        href = markup.get_attr(attrs, "href")
+        if (markup.get_attr(attrs, "rel") or "").lower() == "stylesheet" and href and markup.is_local(href):
+            links.append((match.group(0), markup.resolve(page, href)))
+    if not links:
+        return html
+
+    imports: List[str] = []
+    full: List[css.Node] = []
+    above: List[css.Node] = []
+    usage = page_usage(html, scripts)
+    fold_usage = page_usage(_fold(html), scripts)
+    for _, sheet in links:
+        nodes = css.parse((bundler.root / sheet).read_text(encoding="utf-8"))
+        imports += [url for url in css.imports(nodes) if url not in imports]
+        kept = css.prune(nodes, usage)
+        full += css.rebase_urls(kept, sheet, CSS_BUNDLE + ".css")
+        above += css.rebase_urls(css.prune(kept, fold_usage), sheet, page)
+
+    bundle = bundler.write(CSS_BUNDLE + ".css", css.serialize(full).encode("utf-8"))
+    href = markup.relative(page, bundle)
+    head = ["<style>%s</style>" % css.serialize(above)]
+    head += [ASYNC_STYLESHEET % (url, url) for url in imports]
+    head.append(ASYNC_STYLESHEET % (href, href))
+
+    first, _ = links[0]
+    html = html.replace(first, "\n  ".join(head), 1)
+    for tag, _ in links[1:]:
+        html = _remove(html, tag)
+    return html
+
+
+def _isolated(code: str) -> str:
+    return "try{\n%s}catch(e){console.error(e)}" % code  # minify() ends with a newline
+
+
+def join_scripts(sources: List[str]) -> str:
+    """Minify and concatenate scripts, keeping separate ``<script>`` failure semantics.
+
+    As separate tags, an exception in one file didn't stop the next. Each
+    file is wrapped in ``try``/``catch`` to keep it that way, except files
+    whose top-level ``const``/``let``/``class`` names another file uses:
+    inside a block those would no longer be global, and the files using
+    them can't run without them anyway. ``"use strict"`` files are left
+    alone too, as the directive only counts at the top of a script.
+    """
+    minified = [js.minify(source) for source in sources]
+    out = []
+    for i, code in enumerate(minified):
+        others = minified[:i] + minified[i + 1:]
+        shared = any(re.search(r"(?<![\w$.])%s(?![\w$])" % re.escape(name), other)
+                     for name in js.top_level_bindings(code) for other in others)
+        strict = re.match(r"""(['"])use strict\1""", code)
+        out.append(code if shared or strict else _isolated(code))
+    return "\n;".join(out)
+
+
+def bundle_scripts(html: str, page: str, bundler: Bundler, matches: List[re.Match], sources: List[str]) -> str:
+    if matches:
+        code = join_scripts(sources)
+        src = markup.relative(page, bundler.write(JS_BUNDLE + ".js", code.encode("utf-8")))
+        tags = [m.group(0) for m in matches]
+        html = html.replace(tags[0], '<script src="%s" defer></script>' % src, 1)
+        for tag in tags[1:]:
+            html = _remove(html, tag)
+
+    # Everything left with a src (p5, p5.sound) is deferred too; deferred
+    # scripts still run in document order, before DOMContentLoaded.
+    out = []
+    pos = 0
+    for match in markup.find_tags(html, "script"):
+        attrs = markup.parse_attrs(match.group(3))
+        if match.group(1) or markup.get_attr(attrs, "src") is None:
+            continue
+        if any(key in ("defer", "async") for key, _ in attrs) or \
+                (markup.get_attr(attrs, "type") or "").lower() == "module":
+            continue
+        attrs.append(("defer", None))
+        out.append(html[pos:match.start()])
+        out.append(markup.render_tag("script", attrs))
+        pos = match.end()
+    out.append(html[pos:])
+    return "".join(out)
+
+
+def _fingerprint_url(url: str, page: str, bundler: Bundler) -> str:
+    if not markup.is_local(url) or url.startswith("data:") or FINGERPRINT_RE.search(url):
+        return url
+    path = markup.resolve(page, url)
+    if path.endswith(".html"):
+        return url
+    rel = bundler.asset(path)
+    return markup.relative(page, rel) if rel else url
+
+
+def fingerprint_urls(html: str, page: str, bundler: Bundler) -> str:
+    out = []
+    pos = 0
+    for match in markup.find_tags(html, *URL_ATTRS):
+        if match.group(1):
+            continue
+        name = match.group(2).lower()
+        attrs = markup.parse_attrs(match.group(3))
+        if name == "link" and (markup.get_attr(attrs, "rel") or "").lower() in ("alternate", "prefetch", "canonical"):
+            continue
+        changed = False
+        for attr in URL_ATTRS[name]:
+            value = markup.get_attr(attrs, attr)
+            if not value:
+                continue
+            if attr.endswith("srcset"):
+                candidates = []
+                for candidate in value.split(","):
+                    parts = candidate.split()
+                    if parts:
+                        parts[0] = _fingerprint_url(parts[0], page, bundler)
+                    candidates.append(" ".join(parts))
+                new = ", ".join(candidates)
+            else:
+                new = _fingerprint_url(value, page, bundler)
+            if new != value:
+                markup.set_attr(attrs, attr, new)
+                changed = True
+        if changed:
+            out.append(html[pos:match.start()])
+            out.append(markup.render_tag(match.group(2), attrs))
+            pos = match.end()
+    out.append(html[pos:])
+    return "".join(out)
+
+
+def rewrite_page(html: str, page: str, bundler: Bundler) -> str:
+    matches = _local_scripts(html, page, bundler.root)
+    sources = [_script_source(m, page, bundler.root) for m in matches]
+    inline = [m.group(2) for m in _SCRIPT_RE.finditer(html)]
+    html = bundle_styles(html, page, bundler, sources + inline)
+    # Positions moved once the styles were replaced; find the scripts again
+    matches = _local_scripts(html, page, bundler.root)
+    html = bundle_scripts(html, page, bundler, matches, sources)
+    return fingerprint_urls(html, page, bundler)
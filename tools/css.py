@@ -0,0 +1,347 @@
+"""Small CSS parser used to prune, split and minify the site's stylesheets.
+
+The stylesheets are hand-written and only use plain rules, ``@media``,
+``@supports``, ``@keyframes`` and one ``@import``, so a brace-matching
+parser that respects strings and parentheses is enough. Rules are kept as
+selector lists plus their raw declaration text; nothing is reordered, so
+the cascade of whatever survives pruning is unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Iterable, List, Optional, Set, Union
+
+from . import markup
+
+# At-rules whose body is itself a list of rules.
+GROUP_RULES = {"media", "supports", "layer", "container", "document"}
+
+
+class Rule:
+    def __init__(self, selectors: List[str], declarations: str):
+        self.selectors = selectors
+        self.declarations = declarations
+
+
+class AtRule:
+    """``@name prelude;``, ``@name prelude { rules }`` or ``@name prelude { raw }``."""
+
+    def __init__(self, prelude: str, children: Optional[List["Node"]] = None, body: Optional[str] = None):
+        self.prelude = prelude
+        self.name = re.match(r"@([\w-]+)", prelude).group(1).lower()
+        self.children = children
+        self.body = body
+
+
+Node = Union[Rule, AtRule]
+
+
+def _skip_string(text: str, i: int) -> int:
+    quote = text[i]
+    i += 1
+    while i < len(text) and text[i] != quote:
+        i += 2 if text[i] == "\\" else 1
+    return i + 1
+
+
+def strip_comments(text: str) -> str:
+    out = []
+    i = 0
+    while i < len(text):
+        if text[i] in "\"'":
+            j = _skip_string(text, i)
+            out.append(text[i:j])
+            i = j
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = len(text) if end < 0 else end + 2
+        else:
+            out.append(text[i])
+            i += 1
+    return "".join(out)
+
+
+def _scan(text: str, i: int, stops: str) -> int:
+    """Index of the first of ``stops`` at depth 0, skipping strings and parens."""
+    depth = 0
+    while i < len(text):
+        c = text[i]
+        if c in "\"'":
+            i = _skip_string(text, i)
+            continue
+        if c in "([":
+            depth += 1
+        elif c in ")]":
+            depth -= 1
+        elif depth == 0 and c in stops:
+            return i
+        i += 1
+    return len(text)
+
+
+def _matching_brace(text: str, i: int) -> int:
+    depth = 0
+    while i < len(text):
+        c = text[i]
+        if c in "\"'":
+            i = _skip_string(text, i)
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(text)
+
+
+def split_top_level(text: str, sep: str) -> List[str]:
+    parts = []
+    while True:
+        end = _scan(text, 0, sep)
+        parts.append(text[:end])
+        if end >= len(text):
+            return parts
+        text = text[end + 1:]
+
+
+def _parse_rules(text: str, i: int, end: int) -> List[Node]:
+    nodes: List[Node] = []
+    while True:
+        while i < end and text[i].isspace():
+            i += 1
+        if i >= end:
+            return nodes
+        stop = min(_scan(text, i, "{;}"), end)
+        prelude = text[i:stop].strip()
+        if stop >= end or text[stop] == "}":
+            return nodes  # stray text or an unbalanced brace
+        if text[stop] == ";":
+            if prelude.startswith("@"):
+                nodes.append(AtRule(prelude))
+            i = stop + 1
+            continue
+        close = _matching_brace(text, stop)
+        if prelude.startswith("@"):
+            node = AtRule(prelude)
+            if node.name in GROUP_RULES:
+                node.children = _parse_rules(text, stop + 1, close)
+            else:
+                node.body = text[stop + 1:close]
+            nodes.append(node)
+        elif prelude:
+            selectors = [s.strip() for s in split_top_level(prelude, ",")]
+            nodes.append(Rule(selectors, text[stop + 1:close]))
+        i = close + 1
+
+
+def parse(text: str) -> List[Node]:
+    text = strip_comments(text)
+    return _parse_rules(text, 0, len(text))
+
+
+# --- Usage ---------------------------------------------------------------
+
+_PSEUDO_RE = re.compile(r"::?[a-zA-Z-]+(\((?:[^()]|\([^()]*\))*\))?")
+_ATTR_SELECTOR_RE = re.compile(r"\[[^\]]*\]")
+_SIMPLE_RE = re.compile(r"([.#]?)(-?[_a-zA-Z][\w-]*)")
+_HTML_TAG_RE = re.compile(r"<([a-zA-Z][\w-]*)([^>]*)>")
+_JS_STRING_RE = re.compile(r"""(['"])((?:\\.|(?!\1)[^\\\n])*)\1|`((?:\\.|[^\\`])*)`""", re.DOTALL)
+_WORD_SPLIT_RE = re.compile(r"[^\w-]+")
+
+
+class Usage:
+    """Tag names, classes and ids a page can ever have.
+
+    Names come from the markup plus every word inside a string literal of
+    the page's scripts, so classes toggled from JavaScript count as used.
+    For template literals, the text right before a ``${...}`` is kept as a
+    prefix (``stagger-${i}`` keeps every ``.stagger-*`` rule).
+    """
+
+    def __init__(self):
+        self.names: Set[str] = set()
+        self.prefixes: Set[str] = set()
+
+    def add_html(self, html: str) -> None:
+        for match in _HTML_TAG_RE.finditer(html):
+            self.names.add(match.group(1).lower())
+            attrs = markup.parse_attrs(match.group(2))
+            self.names.update((markup.get_attr(attrs, "class") or "").split())
+            identifier = markup.get_attr(attrs, "id")
+            if identifier:
+                self.names.add(identifier)
+
+    def add_script(self, source: str) -> None:
+        for match in _JS_STRING_RE.finditer(source):
+            if match.group(3) is None:
+                self.names.update(_WORD_SPLIT_RE.split(match.group(2)))
+                continue
+            for chunk in re.split(r"\$\{[^}]*\}", match.group(3)):
+                self.names.update(_WORD_SPLIT_RE.split(chunk))
+            for prefix in re.findall(r"([\w-]+)\$\{", match.group(3)):
+                self.prefixes.add(prefix)
+
+    def has(self, name: str) -> bool:
+        return name in self.names or any(name.startswith(p) for p in self.prefixes)
+
+    def selector_used(self, selector: str) -> bool:
+        if "\\" in selector:
+            return True  # escaped class names are not worth guessing at
+        simple = _ATTR_SELECTOR_RE.sub(" ", _PSEUDO_RE.sub(" ", selector))
+        for prefix, name in _SIMPLE_RE.findall(simple):
+            if not self.has(name if prefix else name.lower()):
+                return False
+        return True
+
+
+def _animation_names(nodes: Iterable[Node]) -> Set[str]:
+    names: Set[str] = set()
+    for node in nodes:
+        if isinstance(node, Rule):
+            for declaration in split_top_level(node.declarations, ";"):
+                prop, _, value = declaration.partition(":")
+                if prop.strip().lower() in ("animation", "animation-name"):
+                    names.update(re.findall(r"-?[_a-zA-Z][\w-]*", value))
+        elif node.children is not None:
+            names |= _animation_names(node.children)
+    return names
+
+
+def _filter(nodes: List[Node], keep: Callable[[str], bool]) -> List[Node]:
+    out: List[Node] = []
+    for node in nodes:
+        if isinstance(node, Rule):
+            selectors = [s for s in node.selectors if keep(s)]
+            if selectors:
+                out.append(Rule(selectors, node.declarations))
+        elif node.children is not None:
+            children = _filter(node.children, keep)
+            if children:
+                out.append(AtRule(node.prelude, children=children))
+        elif node.body is not None:
+            out.append(node)
+    return out
+
+
+def prune(nodes: List[Node], usage: Usage) -> List[Node]:
+    """Drop selectors ``usage`` can never match, and keyframes nobody runs.
+
+    Statement at-rules (``@import``, ``@charset``) are dropped too; callers
+    collect them separately with :func:`imports`.
+    """
+    kept = _filter(nodes, usage.selector_used)
+    animations = _animation_names(kept)
+
+    def drop_keyframes(items: List[Node]) -> List[Node]:
+        out: List[Node] = []
+        for node in items:
+            if isinstance(node, AtRule) and node.name.endswith("keyframes"):
+                name = node.prelude.split(None, 1)[1].strip() if " " in node.prelude else ""
+                if name.strip("\"'") not in animations and not usage.has(name.strip("\"'")):
+                    continue
+            elif isinstance(node, AtRule) and node.children is not None:
+                node = AtRule(node.prelude, children=drop_keyframes(node.children))
+            out.append(node)
+        return out
+
+    return drop_keyframes(kept)
+
+
+def imports(nodes: List[Node]) -> List[str]:
+    """URLs of the top-level ``@import`` rules."""
+    urls = []
+    for node in nodes:
+        if isinstance(node, AtRule) and node.name == "import":
+            match = re.search(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)|['"]([^'"]+)['"]""", node.prelude)
+            if match:
+                urls.append(match.group(1) or match.group(2))
+    return urls
+
+
+_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+def rebase_urls(nodes: List[Node], sheet: str, page: str) -> List[Node]:
+    """Rewrite local ``url()`` references in ``sheet`` to be relative to ``page``."""
+
+    def fix(text: str) -> str:
+        def repl(match: re.Match) -> str:
+            url = match.group(2)
+            if not markup.is_local(url) or url.startswith("data:"):
+                return match.group(0)
+            path = markup.resolve(sheet, url)
+            return "url(%s%s%s)" % (match.group(1), markup.relative(page, path), match.group(1))
+        return _URL_RE.sub(repl, text)
+
+    out: List[Node] = []
+    for node in nodes:
+        if isinstance(node, Rule):
+            out.append(Rule(node.selectors, fix(node.declarations)))
+        elif node.children is not None:
+            out.append(AtRule(node.prelude, children=rebase_urls(node.children, sheet, page)))
+        elif node.body is not None:
+            out.append(AtRule(node.prelude, body=fix(node.body)))
+        else:
+            out.append(node)
+    return out
+
+
+# --- Output --------------------------------------------------------------
+
+def _squeeze(text: str, tight_before: str, tight_after: str) -> str:
+    """Collapse whitespace outside strings, dropping it next to ``tight`` chars."""
+    out: List[str] = []
+    i = 0
+    pending = False
+    while i < len(text):
+        c = text[i]
+        if c.isspace():
+            pending = True
+            i += 1
+            continue
+        if pending and out and out[-1][-1] not in tight_after and c not in tight_before:
+            out.append(" ")
+        pending = False
+        if c in "\"'":
+            j = _skip_string(text, i)
+            out.append(text[i:j])
+            i = j
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+def _minify_declarations(text: str) -> str:
+    out = []
+    for declaration in split_top_level(text, ";"):
+        prop, colon, value = declaration.partition(":")
+        if not colon or not prop.strip():
+            continue
+        value = _squeeze(value.strip(), ",)!", ",(")
+        out.append("%s:%s" % (prop.strip(), value))
+    return ";".join(out)
+
+
+def serialize(nodes: List[Node]) -> str:
+    out = []
+    for node in nodes:
+        if isinstance(node, Rule):
+            selectors = ",".join(_squeeze(s, ">+~,", ">+~,") for s in node.selectors)
+            out.append("%s{%s}" % (selectors, _minify_declarations(node.declarations)))
+            continue
+        prelude = _squeeze(node.prelude, ":,)", ":,(")
+        if node.children is not None:
+            out.append("%s{%s}" % (prelude, serialize(node.children)))
+        elif node.body is not None:
+            body = node.body
+            # Keyframe steps and @font-face descriptors parse like rules
+            inner = _parse_rules(body, 0, len(body)) if "{" in body else None
+            out.append("%s{%s}" % (prelude, serialize(inner) if inner is not None else _minify_declarations(body)))
+        else:
+            out.append(prelude + ";")
+    return "".join(out)
+
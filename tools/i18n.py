@@ -0,0 +1,137 @@
+"""Compile bilingual pages into one pre-rendered file per language.
+
+Pages carry both languages inline: elements with ``data-vi``/``data-en``
+attributes hold Vietnamese text and the English translation. Instead of
+swapping that text in the browser after first paint, the build writes a
+variant per language (``index.html`` stays Vietnamese, ``index.en.html``
+is English) with the text, ``<html lang>`` and the ``lang-*`` body class
+already in place. The variants link to each other with ``hreflang``
+alternates, which ``initLanguageToggle`` in ``js/main.js`` navigates
+between, and a small head script sends returning visitors straight to
+the variant they last picked.
+
+Usage::
+
+    python -m tools.build             # variants are written with the pages
+"""
+
+from __future__ import annotations
+
+import html as htmllib
+import posixpath
+import re
+from typing import List, Tuple
+
+from . import markup
+
+DEFAULT_LANGUAGE = "vi"
+LANGUAGES = ("vi", "en")
+STORAGE_KEY = "preferredLang"
+
+_TRANSLATED_RE = re.compile(r"\sdata-en\s*=", re.IGNORECASE)
+# Attribute values may contain ">" (translations often do), so skip over them
+_ATTRS = r"""((?:[^>"']|"[^"]*"|'[^']*')*)"""
+_OPEN_TAG_RE = re.compile(r"<([a-zA-Z][\w-]*)%s>" % _ATTRS)
+_HEAD_RE = re.compile(r"<head\b[^>]*>", re.IGNORECASE)
+_CHARSET_RE = re.compile(r"<meta\s+charset[^>]*>", re.IGNORECASE)
+
+# Elements without content; main.js has no text to swap in them either.
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+                 "link", "meta", "source", "track", "wbr"}
+
+# Runs before the body is parsed, so the wrong language is never painted.
+REDIRECT_JS = (
+    "try{var l=localStorage.getItem('%s');"
+    "var v={%s};"
+    "if(l&&l!=='%s'&&v[l])location.replace(v[l]+location.hash)}catch(e){}"
+)
+
+
+def is_bilingual(html: str) -> bool:
+    return bool(_TRANSLATED_RE.search(html))
+
+
+def variant_page(page: str, lang: str) -> str:
+    """Output path of ``page`` in ``lang``: ``index.html`` -> ``index.en.html``."""
+    if lang == DEFAULT_LANGUAGE:
+        return page
+    stem, ext = posixpath.splitext(page)
+    return "%s.%s%s" % (stem, lang, ext)
+
+
+def _element_end(html: str, name: str, start: int) -> Tuple[int, int]:
+    """Span of the closing tag matching an element opened just before ``start``."""
+    depth = 1
+    pattern = re.compile(r"<(/?)%s(?![\w-])%s>" % (re.escape(name), _ATTRS), re.IGNORECASE)
+    for match in pattern.finditer(html, start):
+        if match.group(0).endswith("/>"):
+            continue
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return match.start(), match.end()
+    raise ValueError("unclosed <%s> at offset %d" % (name, start))
+
+
+def translate(html: str, lang: str) -> str:
+    """Replace the text of every ``data-<lang>`` element with that attribute."""
+    if lang == DEFAULT_LANGUAGE:
+        return html
+    out = []
+    pos = 0
+    for match in _OPEN_TAG_RE.finditer(html):
+        if match.start() < pos or match.group(1).lower() in VOID_ELEMENTS or match.group(2).endswith("/"):
+            continue
+        attrs = markup.parse_attrs(match.group(2))
+        text = markup.get_attr(attrs, "data-" + lang)
+        if text is None or markup.get_attr(attrs, "data-" + DEFAULT_LANGUAGE) is None:
+            continue
+        close_start, close_end = _element_end(html, match.group(1), match.end())
+        out.append(html[pos:match.end()])
+        out.append(htmllib.escape(htmllib.unescape(text), quote=False))
+        out.append(html[close_start:close_end])
+        pos = close_end
+    out.append(html[pos:])
+    return "".join(out)
+
+
+def _set_tag_attr(html: str, name: str, attr: str, update) -> str:
+    """Rewrite ``attr`` of the first ``<name>`` tag with ``update(old)``."""
+    for match in markup.find_tags(html, name):
+        if match.group(1):
+            continue
+        attrs = markup.parse_attrs(match.group(3))
+        markup.set_attr(attrs, attr, update(markup.get_attr(attrs, attr)))
+        return html[:match.start()] + markup.render_tag(match.group(2), attrs) + html[match.end():]
+    return html
+
+
+def _head_tags(page: str, lang: str) -> str:
+    urls = {other: markup.relative(page, variant_page(page, other)) for other in LANGUAGES}
+    lines = ['<link rel="alternate" hreflang="%s" href="%s">' % (other, urls[other]) for other in LANGUAGES]
+    targets = ",".join("%s:'%s'" % (other, urls[other]) for other in LANGUAGES)
+    lines.append("<script>%s</script>" % (REDIRECT_JS % (STORAGE_KEY, targets, lang)))
+    return "\n  ".join(lines)
+
+
+def compile_page(html: str, page: str, lang: str) -> str:
+    html = translate(html, lang)
+    html = _set_tag_attr(html, "html", "lang", lambda old: lang)
+
+    def add_class(old):
+        classes = [c for c in (old or "").split() if not c.startswith("lang-")]
+        return " ".join(classes + ["lang-" + lang])
+
+    html = _set_tag_attr(html, "body", "class", add_class)
+    # Right after <meta charset> so the redirect runs before any stylesheet loads
+    anchor = _CHARSET_RE.search(html) or _HEAD_RE.search(html)
+    if anchor is None:
+        raise ValueError("%s has no <head> for the language redirect" % page)
+    at = anchor.end()
+    return html[:at] + "\n  " + _head_tags(page, lang) + html[at:]
+
+
+def variants(html: str, page: str) -> List[Tuple[str, str]]:
+    """``(output page, html)`` for every language ``page`` is published in."""
+    if not is_bilingual(html):
+        return [(page, html)]
+    return [(variant_page(page, lang), compile_page(html, page, lang)) for lang in LANGUAGES]
@@ -0,0 +1,279 @@
+"""Responsive image pipeline.
+
+Every PNG/JPEG under ``assets/images`` (and the p5 sketch's own
+``sketch/code/asset``) is hashed, byte-identical files are
+collapsed onto one fingerprinted output, and each unique image is encoded
+into a handful of width tiers (WebP, plus AVIF when Pillow supports it)
+with a PNG fallback. Results are recorded in ``dist/assets/img/manifest.json``
+so a rebuild only re-encodes sources whose content actually changed.
+
+``rewrite_page`` then turns ``<img src="assets/images/...">`` tags into
+``<picture>`` elements with ``srcset`` and intrinsic dimensions. The
+``sizes`` each tag is authored with (``imagesizes`` on preloads) is kept
+and copied onto the ``<source>`` elements.
+The sketch reads the manifest at runtime and picks its own tiers.
+
+Usage::
+
+    python -m tools.images            # encode variants only
+    python -m tools.build             # full dist/ build, pages included
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import Image, features
+
+from . import markup
+from .site import DIST, ROOT
+
+SOURCE_DIRS = ("assets/images", "sketch/code/asset")
+SOURCE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+OUTPUT_DIR = "assets/img"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Width tiers in CSS pixels. Sources narrower than a tier stop at their own
+# width; nothing is ever upscaled.
+WIDTHS = (160, 320, 640, 960, 1280, 1920)
+
+# Modern formats in order of preference, with Pillow save options.
+FORMATS = {
+    "avif": ("image/avif", {"quality": 55, "speed": 6}),
+    "webp": ("image/webp", {"quality": 80, "method": 4}),
+}
+FALLBACK = ("png", "image/png", {"optimize": True})
+
+# The rendered width of an image comes from the page: ``sizes`` on the
+# <img>, ``imagesizes`` on a preload. Without one the browser assumes the
+# image fills the viewport, which is also the HTML default.
+DEFAULT_SIZES = "100vw"
+
+
+def available_formats() -> List[str]:
+    return [fmt for fmt in FORMATS if features.check(fmt)]
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tier_widths(width: int) -> List[int]:
+    top = min(width, WIDTHS[-1])
+    return [w for w in WIDTHS if w < top] + [top]
+
+
+class Manifest:
+    """Maps source paths to content hashes and hashes to encoded variants."""
+
+    def __init__(self, dist: Path):
+        self.dist = dist
+        self.path = dist / OUTPUT_DIR / MANIFEST_NAME
+        self.sources: Dict[str, dict] = {}
+        self.images: Dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, dist: Path) -> "Manifest":
+        manifest = cls(dist)
+        try:
+            data = json.loads(manifest.path.read_text())
+        except (OSError, ValueError):
+            return manifest
+        if data.get("version") == MANIFEST_VERSION:
+            manifest.sources = data.get("sources", {})
+            manifest.images = data.get("images", {})
+        return manifest
+
+    def save(self) -> bool:
+        """Write the manifest if it changed, so a no-op build touches nothing."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "sources": self.sources,
+            "images": self.images,
+        }
+        text = json.dumps(data, indent=2, sort_keys=True) + "\n"
+        try:
+            if self.path.read_text() == text:
+                return False
+        except OSError:
+            pass
+        self.path.write_text(text)
+        return True
+
+    def lookup(self, source: str) -> Optional[dict]:
+        record = self.sources.get(source)
+        return self.images.get(record["sha256"]) if record else None
+
+    def outputs(self, entry: dict) -> List[str]:
+        paths = [path for _, path in entry["fallback"]]
+        for variants in entry["variants"].values():
+            paths.extend(path for _, path in variants)
+        return paths
+
+    def is_complete(self, entry: dict) -> bool:
+        return all((self.dist / path).exists() for path in self.outputs(entry))
+
+    def formats(self, entry: dict) -> List[str]:
+        """The modern formats of ``entry``, most preferred first."""
+        return [fmt for fmt in FORMATS if fmt in entry["variants"]]
+
+
+def scan_sources(root: Path) -> List[str]:
+    found = []
+    for directory in SOURCE_DIRS:
+        for path in sorted((root / directory).iterdir()):
+            if path.is_file() and path.suffix.lower() in SOURCE_SUFFIXES:
+                found.append(path.relative_to(root).as_posix())
+    return found
+
+
+def encode(source: Path, sha: str, dist: Path, formats: List[str]) -> dict:
+    """Write every tier of one unique image and return its manifest entry."""
+    stem = re.sub(r"[^A-Za-z0-9_-]+", "-", source.stem)
+    with Image.open(source) as opened:
+        original = opened.convert("RGBA" if "A" in opened.getbands() or "transparency" in opened.info else "RGB")
+        width, height = original.size
+        entry = {"width": width, "height": height, "variants": {}, "fallback": []}
+        for tier in tier_widths(width):
+            if tier == width:
+                image = original
+            else:
+                size = (tier, max(1, round(height * tier / width)))
+                image = original.resize(size, Image.LANCZOS)
+            for fmt in formats + [FALLBACK[0]]:
+                options = FALLBACK[2] if fmt == FALLBACK[0] else FORMATS[fmt][1]
+                rel = "%s/%s.%s-%d.%s" % (OUTPUT_DIR, stem, sha[:10], tier, fmt)
+                image.save(dist / rel, **options)
+                bucket = entry["fallback"] if fmt == FALLBACK[0] else entry["variants"].setdefault(fmt, [])
+                bucket.append([tier, rel])
+    return entry
+
+
+def build_images(root: Path = ROOT, dist: Path = DIST, jobs: Optional[int] = None) -> Manifest:
+    """Bring ``dist/assets/img`` up to date and return the manifest."""
+    out_dir = dist / OUTPUT_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = Manifest.load(dist)
+    manifest = Manifest(dist)
+    formats = available_formats()
+
+    groups: Dict[str, List[str]] = {}
+    for rel in scan_sources(root):
+        stat = (root / rel).stat()
+        record = previous.sources.get(rel)
+        if not record or record["size"] != stat.st_size or record["mtime_ns"] != stat.st_mtime_ns:
+            record = {"sha256": file_digest(root / rel), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        manifest.sources[rel] = record
+        groups.setdefault(record["sha256"], []).append(rel)
+
+    pending = {}
+    for sha, paths in groups.items():
+        entry = previous.images.get(sha)
+        if entry and set(entry["variants"]) == set(formats) and previous.is_complete(entry):
+            manifest.images[sha] = entry
+        else:
+            pending[sha] = paths[0]
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = {sha: pool.submit(encode, root / rel, sha, dist, formats) for sha, rel in pending.items()}
+        for sha, future in futures.items():
+            manifest.images[sha] = future.result()
+
+    keep = {Path(p).name for entry in manifest.images.values() for p in manifest.outputs(entry)}
+    # The manifest and the gzip copy tools.build writes for tools.serve
+    keep.update((MANIFEST_NAME, MANIFEST_NAME + ".gz"))
+    for path in out_dir.iterdir():
+        if path.name not in keep:
+            path.unlink()
+
+    manifest.save()
+    duplicates = sum(len(paths) - 1 for paths in groups.values())
+    print("images: %d sources, %d unique, %d duplicates, %d encoded" % (
+        len(manifest.sources), len(groups), duplicates, len(pending)))
+    return manifest
+
+
+def _srcset(page: str, variants: List[list]) -> str:
+    return ", ".join("%s %dw" % (markup.relative(page, path), width) for width, path in variants)
+
+
+def rewrite_page(html: str, page: str, manifest: Manifest) -> str:
+    """Point the ``<img>`` tags and image preloads of ``page`` at the variants."""
+    out = []
+    pos = 0
+    picture_depth = 0
+    for match in markup.find_tags(html, "picture", "img", "link"):
+        closing, name = match.group(1), match.group(2).lower()
+        if name == "picture":
+            picture_depth += -1 if closing else 1
+            continue
+        attrs = markup.parse_attrs(match.group(3))
+        url = markup.get_attr(attrs, "href" if name == "link" else "src")
+        if not url or not markup.is_local(url):
+            continue
+        source = markup.resolve(page, url)
+        entry = manifest.lookup(source)
+        if entry is None:
+            continue
+        sizes = markup.get_attr(attrs, "imagesizes" if name == "link" else "sizes") or DEFAULT_SIZES
+        formats = manifest.formats(entry)
+
+        if name == "link":
+            if markup.get_attr(attrs, "rel") != "preload" or markup.get_attr(attrs, "as") != "image":
+                continue
+            best = formats[0] if formats else None
+            variants = entry["variants"][best] if best else entry["fallback"]
+            markup.set_attr(attrs, "href", markup.relative(page, variants[-1][1]))
+            markup.set_attr(attrs, "imagesrcset", _srcset(page, variants))
+            markup.set_attr(attrs, "imagesizes", sizes)
+            if best:
+                markup.set_attr(attrs, "type", FORMATS[best][0])
+            replacement = markup.render_tag("link", attrs)
+        else:
+            markup.set_attr(attrs, "src", markup.relative(page, entry["fallback"][-1][1]))
+            markup.set_attr(attrs, "srcset", _srcset(page, entry["fallback"]))
+            markup.set_attr(attrs, "sizes", sizes)
+            if markup.get_attr(attrs, "width") is None and markup.get_attr(attrs, "height") is None:
+                markup.set_attr(attrs, "width", str(entry["width"]))
+                markup.set_attr(attrs, "height", str(entry["height"]))
+            replacement = markup.render_tag("img", attrs)
+            if picture_depth == 0:
+                sources = "".join(
+                    markup.render_tag("source", [
+                        ("type", FORMATS[fmt][0]),
+                        ("srcset", _srcset(page, entry["variants"][fmt])),
+                        ("sizes", sizes),
+                    ])
+                    for fmt in formats
+                )
+                replacement = "<picture>%s%s</picture>" % (sources, replacement)
+
+        out.append(html[pos:match.start()])
+        out.append(replacement)
+        pos = match.end()
+    out.append(html[pos:])
+    return "".join(out)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dist", type=Path, default=DIST, help="output tree (default: dist/)")
+    parser.add_argument("-j", "--jobs", type=int, help="encoder threads (default: CPU count)")
+    args = parser.parse_args(argv)
+    build_images(ROOT, args.dist, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
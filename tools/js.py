@@ -0,0 +1,201 @@
+"""Conservative JavaScript minifier for the site's own scripts.
+
+Only comments and redundant whitespace are removed. Line breaks are kept
+(collapsed to one), so automatic semicolon insertion behaves exactly as
+in the source, and names are never mangled. That is most of the win on
+these heavily commented files without needing a JavaScript toolchain.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Set
+
+# After these characters a "/" starts a regular expression, not a division.
+_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new",
+                   "delete", "void", "throw", "yield", "await", "instanceof"}
+_WORD_TAIL_RE = re.compile(r"[\w$]+$")
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c in "_$" or ord(c) > 127
+
+
+def _skip_string(src: str, i: int) -> int:
+    quote = src[i]
+    i += 1
+    while i < len(src) and src[i] != quote:
+        i += 2 if src[i] == "\\" else 1
+    return i + 1
+
+
+def _skip_template(src: str, i: int) -> int:
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+        elif c == "`":
+            return i + 1
+        elif src.startswith("${", i):
+            i = _skip_code(src, i + 2)
+        else:
+            i += 1
+    return i
+
+
+def _skip_code(src: str, i: int) -> int:
+    """Skip a ``${...}`` expression, returning the index after its ``}``."""
+    depth = 1
+    while i < len(src):
+        c = src[i]
+        if c in "\"'":
+            i = _skip_string(src, i)
+            continue
+        if c == "`":
+            i = _skip_template(src, i)
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _skip_regex(src: str, i: int) -> int:
+    i += 1
+    in_class = False
+    while i < len(src) and src[i] != "\n":
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < len(src) and _is_word(src[i]):
+                i += 1  # flags
+            return i
+        i += 1
+    return i
+
+
+def _regex_allowed(before: str) -> bool:
+    """Whether a ``/`` after the code ``before`` starts a regular expression."""
+    before = before.rstrip()
+    word = _WORD_TAIL_RE.search(before)
+    return not before or before[-1] in _REGEX_AFTER or bool(word and word.group(0) in _REGEX_KEYWORDS)
+
+
+def minify(src: str) -> str:
+    out: List[str] = []
+    space = newline = False
+    i = 0
+
+    def last() -> str:
+        return out[-1][-1] if out else ""
+
+    def emit(token: str) -> None:
+        nonlocal space, newline
+        prev = last()
+        if newline and out and prev != "\n":
+            out.append("\n")
+        elif space and prev and (
+            (_is_word(prev) and _is_word(token[0])) or (prev in "+-" and token[0] in "+-")
+        ):
+            out.append(" ")
+        space = newline = False
+        out.append(token)
+
+    while i < len(src):
+        c = src[i]
+        if c == "\n":
+            newline = True
+            i += 1
+        elif c.isspace():
+            space = True
+            i += 1
+        elif src.startswith("//", i):
+            end = src.find("\n", i)
+            i = len(src) if end < 0 else end
+        elif src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            end = len(src) if end < 0 else end + 2
+            if "\n" in src[i:end]:
+                newline = True
+            else:
+                space = True
+            i = end
+        elif c in "\"'":
+            j = _skip_string(src, i)
+            emit(src[i:j])
+            i = j
+        elif c == "`":
+            j = _skip_template(src, i)
+            emit(src[i:j])
+            i = j
+        elif c == "/":
+            if _regex_allowed("".join(out[-3:])):
+                j = _skip_regex(src, i)
+                emit(src[i:j])
+                i = j
+            else:
+                emit(c)
+                i += 1
+        else:
+            j = i + 1
+            if _is_word(c):
+                while j < len(src) and _is_word(src[j]):
+                    j += 1
+            emit(src[i:j])
+            i = j
+    return "".join(out).strip() + "\n"
+
+
+_DECLARATION_RE = re.compile(r"^(?:const|let|class)\s+(.*)$")
+_NAME_RE = re.compile(r"[A-Za-z_$][\w$]*")
+
+
+def top_level_bindings(src: str) -> Set[str]:
+    """Names declared with ``const``, ``let`` or ``class`` at the top level.
+
+    Classic scripts share these through the global lexical scope, so they
+    stop being visible to other scripts once the file is wrapped in a block.
+    Destructuring patterns are not looked into.
+    """
+    code = minify(src)
+    skeleton: List[str] = []
+    depth = 0
+    i = 0
+    while i < len(code):
+        c = code[i]
+        if c in "\"'`" or (c == "/" and _regex_allowed(code[max(0, i - 32):i])):
+            i = (_skip_template if c == "`" else _skip_regex if c == "/" else _skip_string)(code, i)
+            if depth == 0:
+                skeleton.append('""')
+            continue
+        if c in "{([":
+            depth += 1
+        elif c in "})]":
+            depth -= 1
+        elif depth == 0:
+            skeleton.append(c)
+        i += 1
+
+    names: Set[str] = set()
+    for statement in re.split(r"[;\n]", "".join(skeleton)):
+        match = _DECLARATION_RE.match(statement.strip())
+        if not match:
+            continue
+        for declarator in match.group(1).split(","):
+            name = _NAME_RE.match(declarator.strip())
+            if name:
+                names.add(name.group(0))
+    return names
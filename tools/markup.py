@@ -0,0 +1,76 @@
+"""Small helpers for editing tags in hand-written HTML.
+
+The pages are authored by hand, so the tools rewrite individual tags in
+place with regular expressions instead of re-serialising a parsed DOM.
+That keeps comments, indentation and attribute order intact.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import re
+from typing import Iterator, List, Optional, Tuple
+
+Attrs = List[Tuple[str, Optional[str]]]
+
+_ATTR_RE = re.compile(
+    r"""([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""",
+)
+
+
+def find_tags(html: str, *names: str) -> Iterator[re.Match]:
+    """Yield matches for opening (and closing) tags with the given names."""
+    pattern = r"<(/?)(%s)\b([^>]*)>" % "|".join(map(re.escape, names))
+    return re.finditer(pattern, html, re.IGNORECASE)
+
+
+def parse_attrs(source: str) -> Attrs:
+    """Parse the attribute section of a tag into ``(name, value)`` pairs."""
+    attrs: Attrs = []
+    for match in _ATTR_RE.finditer(source.rstrip("/")):
+        name, dq, sq, bare = match.groups()
+        value = dq if dq is not None else sq if sq is not None else bare
+        attrs.append((name.lower(), value))
+    return attrs
+
+
+def get_attr(attrs: Attrs, name: str) -> Optional[str]:
+    for key, value in attrs:
+        if key == name:
+            return value
+    return None
+
+
+def set_attr(attrs: Attrs, name: str, value: Optional[str]) -> None:
+    """Replace ``name`` in place, or append it if the tag does not have it."""
+    for i, (key, _) in enumerate(attrs):
+        if key == name:
+            attrs[i] = (name, value)
+            return
+    attrs.append((name, value))
+
+
+def render_tag(name: str, attrs: Attrs) -> str:
+    parts = [name]
+    for key, value in attrs:
+        if value is None:
+            parts.append(key)
+        else:
+            parts.append('%s="%s"' % (key, value.replace('"', "&quot;")))
+    return "<%s>" % " ".join(parts)
+
+
+def is_local(url: str) -> bool:
+    """True for URLs that point into this site rather than elsewhere."""
+    return not re.match(r"^([a-z][a-z0-9+.-]*:|//|#)", url, re.IGNORECASE)
+
+
+def resolve(page: str, url: str) -> str:
+    """Resolve ``url`` as written in ``page`` to a path relative to the root."""
+    url = url.split("#", 1)[0].split("?", 1)[0]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(page), url))
+
+
+def relative(page: str, path: str) -> str:
+    """Inverse of :func:`resolve`: the URL ``page`` should use for ``path``."""
+    return posixpath.relpath(path, posixpath.dirname(page) or ".")
@@ -0,0 +1,464 @@
+"""Async static file server for the built site.
+
+Serves ``dist/`` the way the production origin should:
+
+* ``.gz`` siblings written by the build are sent to clients that accept
+  gzip (``Vary: Accept-Encoding``); nothing is compressed per request;
+* every response carries a strong ``ETag`` (a content hash, per
+  representation) and ``Last-Modified``; ``If-None-Match`` and
+  ``If-Modified-Since`` are answered with 304;
+* single ``Range`` requests (audio seeking, large images) get 206, with
+  ``If-Range`` honoured and 416 for unsatisfiable ranges;
+* fingerprinted files are ``immutable`` for a year, pages are
+  revalidated every time, anything else is cached briefly;
+* bodies over ``SENDFILE_THRESHOLD`` go out with ``loop.sendfile`` (zero
+  copy where the platform supports it);
+* ``/__stats`` returns per-route request counts, status codes, bytes sent
+  and latency percentiles as JSON.
+
+The benchmark (``tools.bench``) runs the same server in a thread.
+
+Usage::
+
+    python -m tools.build
+    python -m tools.serve [--root DIR] [--host HOST] [--port PORT]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import email.utils
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .bundle import FINGERPRINT_RE
+from .site import DIST
+
+SENDFILE_THRESHOLD = 64 * 1024
+IDLE_TIMEOUT = 15.0
+MAX_HEADER_BYTES = 16 * 1024
+LATENCY_SAMPLES = 512
+STATS_PATH = "/__stats"
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_PAGE = "no-cache"
+CACHE_ASSET = "public, max-age=3600"
+
+# Types the build precompresses (see tools.build.precompress).
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".svg", ".txt", ".xml"}
+
+MIME_TYPES = {
+    ".avif": "image/avif",
+    ".webp": "image/webp",
+    ".ogg": "audio/ogg",
+    ".otf": "font/otf",
+    ".ttf": "font/ttf",
+    ".woff2": "font/woff2",
+    ".js": "text/javascript",
+    ".json": "application/json",
+}
+
+REASONS = {
+    200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request",
+    404: "Not Found", 405: "Method Not Allowed", 416: "Range Not Satisfiable",
+}
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_QVALUE_RE = re.compile(r"^q=([01](?:\.\d{0,3})?)$")
+
+
+def content_type(path: Path) -> str:
+    kind = MIME_TYPES.get(path.suffix.lower()) or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if kind.startswith("text/") or kind in ("application/json", "image/svg+xml"):
+        kind += "; charset=utf-8"
+    return kind
+
+
+def cache_control(path: Path) -> str:
+    if FINGERPRINT_RE.search(path.name):
+        return CACHE_IMMUTABLE
+    if path.suffix.lower() == ".html":
+        return CACHE_PAGE
+    return CACHE_ASSET
+
+
+def accepts_gzip(header: str) -> bool:
+    """Whether an ``Accept-Encoding`` value allows gzip (``gzip;q=0`` refuses it)."""
+    weights: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            match = _QVALUE_RE.match(param.lower().replace(" ", ""))
+            if match:
+                weight = float(match.group(1))
+        weights[coding.lower()] = weight
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in weights:
+            return weights[coding] > 0
+    return False
+
+
+def file_etag(path: Path) -> str:
+    sha = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return '"%s"' % sha.hexdigest()[:20]
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """``(first, last)`` byte positions, or None when unsatisfiable.
+
+    Raises ValueError for ranges this server does not support (several
+    ranges, other units); those requests get the full body instead.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        raise ValueError(header)
+    first, last = match.groups()
+    if not first and not last:
+        raise ValueError(header)
+    if not first:
+        length = int(last)
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return None
+    return start, end
+
+
+class Representation:
+    """One file on disk as served: its metadata plus a cached strong ETag."""
+
+    def __init__(self, path: Path, etag: str, size: int, mtime: float):
+        self.path = path
+        self.etag = etag
+        self.size = size
+        self.mtime = mtime
+
+
+class Stats:
+    def __init__(self):
+        self.started = time.time()
+        self.routes: Dict[str, dict] = {}
+
+    def record(self, route: str, status: int, sent: int, seconds: float) -> None:
+        entry = self.routes.get(route)
+        if entry is None:
+            entry = self.routes[route] = {
+                "requests": 0, "bytes": 0, "status": collections.Counter(),
+                "latency": collections.deque(maxlen=LATENCY_SAMPLES),
+            }
+        entry["requests"] += 1
+        entry["bytes"] += sent
+        entry["status"][status] += 1
+        entry["latency"].append(seconds * 1000)
+
+    def snapshot(self) -> dict:
+        routes = {}
+        for route, entry in sorted(self.routes.items()):
+            samples = sorted(entry["latency"])
+            routes[route] = {
+                "requests": entry["requests"],
+                "bytes": entry["bytes"],
+                "status": {str(code): count for code, count in sorted(entry["status"].items())},
+                "latency_ms": {
+                    "p50": round(samples[len(samples) // 2], 3),
+                    "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+                    "max": round(samples[-1], 3),
+                },
+            }
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": sum(r["requests"] for r in routes.values()),
+            "bytes": sum(r["bytes"] for r in routes.values()),
+            "routes": routes,
+        }
+
+
+class StaticServer:
+    def __init__(self, root: Path = DIST):
+        self.root = root.resolve()
+        self.stats = Stats()
+        self._etags: Dict[Path, Tuple[int, int, str]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> int:
+        self._server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise hold the loop open
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+
+    # --- Files -------------------------------------------------------------
+
+    async def _etag(self, path: Path, stat: os.stat_result) -> str:
+        cached = self._etags.get(path)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        # Hash in a worker thread so a large file never stalls other connections
+        etag = await asyncio.get_running_loop().run_in_executor(None, file_etag, path)
+        self._etags[path] = (stat.st_size, stat.st_mtime_ns, etag)
+        return etag
+
+    async def _representation(self, path: Path) -> Representation:
+        stat = path.stat()
+        return Representation(path, await self._etag(path, stat), stat.st_size, stat.st_mtime)
+
+    def resolve(self, target: str) -> Optional[Path]:
+        """Map a request path onto a file under the root (no escaping it).
+
+        Raises ValueError for paths no file can have (a NUL byte); paths the
+        filesystem rejects (too long, unreadable) are simply not found.
+        """
+        path = urllib.parse.unquote(target.split("?", 1)[0].split("#", 1)[0])
+        if "\0" in path:
+            raise ValueError("NUL byte in %r" % target)
+        try:
+            candidate = (self.root / path.lstrip("/")).resolve()
+            if candidate != self.root and self.root not in candidate.parents:
+                return None
+            if candidate.is_dir():
+                candidate = candidate / "index.html"
+            return candidate if candidate.is_file() else None
+        except (OSError, RuntimeError):
+            # RuntimeError: a symlink loop, before Python 3.13
+            return None
+
+    # --- HTTP --------------------------------------------------------------
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._simple(writer, 400, "HEAD", keep_alive=False)
+                    return
+                started = time.perf_counter()
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    await self._simple(writer, 400, "GET", keep_alive=False)
+                    return
+                headers: Dict[str, str] = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+                route, status, sent = await self.respond(writer, method, target, headers, keep_alive)
+                self.stats.record(route, status, sent, time.perf_counter() - started)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    def _send_head(self, writer: asyncio.StreamWriter, status: int, headers: List[Tuple[str, str]],
+                   keep_alive: bool) -> None:
+        lines = ["HTTP/1.1 %d %s" % (status, REASONS[status]),
+                 "Date: " + email.utils.formatdate(usegmt=True),
+                 "Connection: " + ("keep-alive" if keep_alive else "close")]
+        lines += ["%s: %s" % item for item in headers]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _simple(self, writer: asyncio.StreamWriter, status: int, method: str, keep_alive: bool,
+                      extra: Optional[List[Tuple[str, str]]] = None, body: bytes = b"",
+                      kind: str = "text/plain; charset=utf-8") -> int:
+        body = body or ("%d %s\n" % (status, REASONS[status])).encode()
+        headers = [("Content-Type", kind), ("Content-Length", str(len(body)))] + (extra or [])
+        self._send_head(writer, status, headers, keep_alive)
+        if method != "HEAD":
+            writer.write(body)
+        await writer.drain()
+        return len(body) if method != "HEAD" else 0
+
+    async def respond(self, writer: asyncio.StreamWriter, method: str, target: str,
+                      headers: Dict[str, str], keep_alive: bool) -> Tuple[str, int, int]:
+        """Send one response; returns ``(route, status, body bytes sent)``."""
+        if method not in ("GET", "HEAD"):
+            sent = await self._simple(writer, 405, method, keep_alive, [("Allow", "GET, HEAD")])
+            return "(other)", 405, sent
+
+        if target.split("?", 1)[0] == STATS_PATH:
+            body = (json.dumps(self.stats.snapshot(), indent=2) + "\n").encode()
+            sent = await self._simple(writer, 200, method, keep_alive, [("Cache-Control", "no-store")],
+                                      body, "application/json")
+            return STATS_PATH, 200, sent
+
+        try:
+            path = self.resolve(target)
+        except ValueError:
+            sent = await self._simple(writer, 400, method, keep_alive)
+            return "(bad request)", 400, sent
+        if path is None:
+            sent = await self._simple(writer, 404, method, keep_alive)
+            return "(not found)", 404, sent
+        route = "/" + path.relative_to(self.root).as_posix()
+
+        # Pick the representation: precompressed unless a range was asked for
+        compressible = path.suffix.lower() in COMPRESSIBLE
+        encoding = None
+        rep = await self._representation(path)
+        gz = path.with_name(path.name + ".gz")
+        if (compressible and "range" not in headers and accepts_gzip(headers.get("accept-encoding", ""))
+                and gz.is_file() and gz.stat().st_mtime >= rep.mtime):
+            rep = await self._representation(gz)
+            rep.mtime = path.stat().st_mtime
+            encoding = "gzip"
+
+        common = [
+            ("ETag", rep.etag),
+            ("Last-Modified", email.utils.formatdate(rep.mtime, usegmt=True)),
+            ("Cache-Control", cache_control(path)),
+            ("Accept-Ranges", "bytes"),
+        ]
+        if compressible:
+            common.append(("Vary", "Accept-Encoding"))
+
+        if self._not_modified(headers, rep):
+            self._send_head(writer, 304, common, keep_alive)
+            await writer.drain()
+            return route, 304, 0
+
+        status = 200
+        first, last = 0, rep.size - 1
+        if "range" in headers and self._if_range(headers, rep):
+            try:
+                byte_range = parse_range(headers["range"], rep.size)
+            except ValueError:
+                byte_range = (first, last)
+            if byte_range is None:
+                sent = await self._simple(writer, 416, method, keep_alive,
+                                          common + [("Content-Range", "bytes */%d" % rep.size)])
+                return route, 416, sent
+            if byte_range != (0, rep.size - 1):
+                status = 206
+                first, last = byte_range
+                common.append(("Content-Range", "bytes %d-%d/%d" % (first, last, rep.size)))
+
+        length = last - first + 1 if rep.size else 0
+        common += [("Content-Type", content_type(path)), ("Content-Length", str(length))]
+        if encoding:
+            common.append(("Content-Encoding", encoding))
+        self._send_head(writer, status, common, keep_alive)
+        if method == "HEAD" or not length:
+            await writer.drain()
+            return route, status, 0
+
+        with rep.path.open("rb") as f:
+            if length >= SENDFILE_THRESHOLD:
+                await writer.drain()
+                loop = asyncio.get_running_loop()
+                await loop.sendfile(writer.transport, f, first, length)
+            else:
+                f.seek(first)
+                writer.write(f.read(length))
+                await writer.drain()
+        return route, status, length
+
+    @staticmethod
+    def _not_modified(headers: Dict[str, str], rep: Representation) -> bool:
+        if "if-none-match" in headers:
+            tags = [tag.strip() for tag in headers["if-none-match"].split(",")]
+            return "*" in tags or rep.etag in tags or "W/" + rep.etag in tags
+        if "if-modified-since" in headers:
+            try:
+                since = email.utils.parsedate_to_datetime(headers["if-modified-since"]).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(rep.mtime) <= since
+        return False
+
+    @staticmethod
+    def _if_range(headers: Dict[str, str], rep: Representation) -> bool:
+        """Whether a Range request may be honoured (``If-Range`` still matches)."""
+        validator = headers.get("if-range")
+        if validator is None:
+            return True
+        if validator.startswith('"'):
+            return validator == rep.etag  # strong comparison only
+        try:
+            return email.utils.parsedate_to_datetime(validator).timestamp() >= int(rep.mtime)
+        except (TypeError, ValueError):
+            return False
+
+
+class ServerThread:
+    """Run a :class:`StaticServer` on its own event loop in a daemon thread."""
+
+    def __init__(self, root: Path = DIST, host: str = "127.0.0.1", port: int = 0):
+        self.server = StaticServer(root)
+        self.loop = asyncio.new_event_loop()
+        self.port = self.loop.run_until_complete(self.server.start(host, port))
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def stats(self) -> dict:
+        return self.server.stats.snapshot()
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(5)
+        self.loop.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the built site with caching, ranges and gzip.")
+    parser.add_argument("--root", type=Path, default=DIST, help="tree to serve (default: dist/)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = StaticServer(args.root)
+        port = await server.start(args.host, args.port)
+        print("serving %s on http://%s:%d/ (stats at %s)" % (args.root, args.host, port, STATS_PATH))
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Shared paths and page list for the build tools."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DIST = ROOT / "dist"
+# Reports and other tool output that must never be published with dist/.
+BUILD = ROOT / "build"
+
+# Every page that is published, relative to ROOT.
+PAGES = (
+    "index.html",
+    "about.html",
+    "gallery.html",
+    "pages/2d3d-design.html",
+    "pages/interactive-code.html",
+    "pages/sound-design.html",
+    "pages/virtual-reality.html",
+    "sketch/code/index.html",
+)
+
+# Directories copied into the published tree alongside the pages.
+STATIC_DIRS = ("assets", "css", "js", "sketch", "sound")
+
+# Finder litter that should never be published.
+IGNORED_NAMES = {".DS_Store"}
+
+
+def is_static(rel: str) -> bool:
+    """True for files under ``STATIC_DIRS`` that are published verbatim.
+
+    Pages that live in a static directory (the sketch) are rendered by the
+    build, so mirroring them would overwrite the rewritten page.
+    """
+    return rel not in PAGES and rel.rsplit("/", 1)[-1] not in IGNORED_NAMES
@@ -0,0 +1,95 @@
+"""Local copies of third-party scripts the pages load from a CDN.
+
+The pages reference p5.js on cdnjs. The build swaps those URLs for the
+copies listed in ``VENDORED`` so the published site (and the benchmark
+server) never depend on a third-party origin. The copies are checked in;
+each is pinned by its SHA-256, and a download that doesn't match is
+refused.
+
+Usage::
+
+    python -m tools.vendor            # download any missing copies
+    python -m tools.vendor --check    # verify the checked-in copies
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+import urllib.request
+from pathlib import Path
+from typing import List, Optional
+
+from . import markup
+from .site import ROOT
+
+# CDN URL -> vendored path, relative to the repository root.
+VENDORED = {
+    "https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.9.4/p5.min.js": "js/vendor/p5.min.js",
+    "https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.9.4/addons/p5.sound.min.js": "sketch/code/p5.sound.min.js",
+}
+
+# Vendored path -> SHA-256 of the copy the site was tested with.
+CHECKSUMS = {
+    "js/vendor/p5.min.js": "00a532c56e785c68d7c7bb6f9a084e2c856b71527f22c3260aff4a2f582d80c9",
+    "sketch/code/p5.sound.min.js": "f067ef7cf80b3561327e7b14661ec980fbd34b2baf1e0a9d529a120132ba0107",
+}
+
+
+def missing(root: Path = ROOT) -> List[str]:
+    return [url for url, path in VENDORED.items() if not (root / path).exists()]
+
+
+def mismatched(root: Path = ROOT) -> List[str]:
+    """Vendored paths whose content is not the pinned version."""
+    return [path for path in VENDORED.values()
+            if (root / path).exists() and hashlib.sha256((root / path).read_bytes()).hexdigest() != CHECKSUMS[path]]
+
+
+def fetch_missing(root: Path = ROOT) -> None:
+    for url in missing(root):
+        path = VENDORED[url]
+        print("fetching %s -> %s" % (url, path))
+        with urllib.request.urlopen(url, timeout=30) as response:
+            data = response.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if digest != CHECKSUMS[path]:
+            raise ValueError("%s has sha256 %s, expected %s" % (url, digest, CHECKSUMS[path]))
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+
+
+def rewrite_page(html: str, page: str, root: Path = ROOT) -> str:
+    """Point CDN ``<script>`` tags of ``page`` at their vendored copies."""
+    out = []
+    pos = 0
+    for match in markup.find_tags(html, "script"):
+        attrs = markup.parse_attrs(match.group(3))
+        path = VENDORED.get(markup.get_attr(attrs, "src") or "")
+        if match.group(1) or path is None or not (root / path).exists():
+            continue
+        markup.set_attr(attrs, "src", markup.relative(page, path))
+        out.append(html[pos:match.start()])
+        out.append(markup.render_tag("script", attrs))
+        pos = match.end()
+    out.append(html[pos:])
+    return "".join(out)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Download missing vendored scripts.")
+    parser.add_argument("--check", action="store_true", help="only report missing copies")
+    args = parser.parse_args(argv)
+    if args.check:
+        for url in missing():
+            print("missing: %s (%s)" % (VENDORED[url], url))
+        for path in mismatched():
+            print("checksum mismatch: %s" % path)
+        sys.exit(1 if missing() or mismatched() else 0)
+    fetch_missing()
+
+
+if __name__ == "__main__":
+    main()